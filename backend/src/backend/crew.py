@@ -1,4 +1,8 @@
+import hashlib
+from types import MappingProxyType
+from typing import Tuple
 import yaml
+from cachetools import LRUCache
 from crewai import Crew, Process
 from tools.advanced_agents import (
     AdvancedSocratesAgent,
@@ -8,8 +12,13 @@ from tools.advanced_agents import (
 )
 
 
+def _cache_key(text: str) -> str:
+    """Normalize and hash a query so cache keys stay small and case/whitespace-insensitive"""
+    return hashlib.md5(text.strip().lower().encode()).hexdigest()
+
+
 class WisdomCrew:
-    def __init__(self):
+    def __init__(self, cache_size: int = 1024):
         # Initialize agents directly without YAML complexity
         self.agents = {
             "socrates": AdvancedSocratesAgent(),
@@ -17,15 +26,46 @@ class WisdomCrew:
             "laotzu": AdvancedLaoTzuAgent(),
             "aristotle": AdvancedAristotleAgent()
         }
+        # Bounded so long-tail traffic can't grow memory without limit. Entries are
+        # per (agent, query) so a query missing one agent's answer only re-runs that agent
+        self._cache = LRUCache(maxsize=cache_size * len(self.agents))
     
-    def ask_wisdom(self, query):
+    async def ask_wisdom(self, query):
         if isinstance(query, dict):
             text = query.get("text", "")
         else:
             text = str(query)
-        responses = {}
-        for name, agent in self.agents.items():
-            responses[name] = agent.generate_response(text)
-        return responses
-
-
+        
+        key = _cache_key(text)
+        return MappingProxyType({name: self._answer(name, key, text) for name in self.agents})
+    
+    async def ask_wisdom_preview(self, query) -> Tuple[str, str]:
+        """Return (agent_name, response) for the first agent with an answer
+        
+        A cached answer from any agent is preferred; otherwise only the first agent
+        is consulted, and a follow-up ask_wisdom fills in the rest.
+        """
+        text = query.get("text", "") if isinstance(query, dict) else str(query)
+        key = _cache_key(text)
+        
+        for name in self.agents:
+            cached = self._cache.get((name, key))
+            if cached is not None:
+                return name, cached
+        
+        name = next(iter(self.agents))
+        return name, self._answer(name, key, text)
+    
+    def _answer(self, name: str, key: str, text: str) -> str:
+        """One agent's answer to the query, from the cache when possible
+        
+        Called directly on the event loop: the rule-based agents are precomposed
+        lookups that take microseconds, less than a hop to a worker thread.
+        """
+        response = self._cache.get((name, key))
+        if response is None:
+            response = self.agents[name].generate_response(text)
+            # Empty answers are not worth keeping; the agent is retried next time
+            if response:
+                self._cache[(name, key)] = response
+        return response
@@ -1,5 +1,118 @@
+import re
+from functools import lru_cache
+from itertools import combinations, product
 from crewai import Agent
-from typing import List, Dict, Any, ClassVar
+from typing import List, Dict, Any, ClassVar, Iterator
+
+# Keyword sets are built once at import. A query matches a keyword when it contains
+# it as a word, or as a word pair for phrases like "have to" and "my response"
+_SOCRATES_ASSUMPTION_TERMS = frozenset({"should", "must", "everyone", "always", "never"})
+_SOCRATES_VALUE_TERMS = frozenset({"good", "bad", "right", "wrong", "success", "happiness"})
+
+_MARCUS_CONTROLLABLE_TERMS = frozenset({"my response", "my effort", "my attitude", "my actions", "my choices"})
+_MARCUS_UNCONTROLLABLE_TERMS = frozenset({"others", "outcome", "result", "future", "past"})
+
+_LAOTZU_FORCING_TERMS = frozenset({"must", "have to", "should", "need to", "force"})
+_LAOTZU_RESISTANCE_TERMS = frozenset({"against", "fighting", "struggling", "can't", "won't"})
+
+_ARISTOTLE_VIRTUE_KEYWORDS = {
+    "courage": ("fear", "afraid", "brave", "risk"),
+    "temperance": ("excess", "control", "discipline"),
+    "justice": ("fair", "right", "wrong", "deserve"),
+    "prudence": ("decision", "choice", "wisdom"),
+    "friendship": ("relationship", "trust", "social")
+}
+_ARISTOTLE_KEYWORD_TO_VIRTUE = {
+    keyword: virtue
+    for virtue, keywords in _ARISTOTLE_VIRTUE_KEYWORDS.items()
+    for keyword in keywords
+}
+
+_WORD_PATTERN = re.compile(r"[a-z']+")
+
+# Contractions and inflections folded back onto the keyword they extend, so "shouldn't"
+# still matches "should", "successful" "success", "decisions" "decision" and
+# "controlling" "control", as the old substring checks did
+_STEM_SUFFIXES = ("n't", "'s", "fully", "ful", "ness", "ing", "ed", "d", "es", "s", "ly")
+_MIN_STEM_LENGTH = 3
+
+
+def _stems(token: str) -> Iterator[str]:
+    for suffix in _STEM_SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= _MIN_STEM_LENGTH:
+            stem = token[:-len(suffix)]
+            yield stem
+            # Doubled final consonant ("controlling", "stopped")
+            if suffix in ("ing", "ed") and stem[-1] == stem[-2]:
+                yield stem[:-1]
+
+
+@lru_cache(maxsize=1024)
+def _query_features(query_lower: str) -> frozenset:
+    """Words, their stems and adjacent word pairs of a query, from one tokenization
+    
+    Every agent consulted on a query gets the same text, so the first agent's call
+    does the scan and the others hit the cache.
+    """
+    tokens = _WORD_PATTERN.findall(query_lower)
+    features = set(tokens)
+    for token in tokens:
+        features.update(_stems(token))
+    features.update(f"{first} {second}" for first, second in zip(tokens, tokens[1:]))
+    return frozenset(features)
+
+
+def _aristotle_virtues(features: frozenset) -> frozenset:
+    return frozenset(
+        _ARISTOTLE_KEYWORD_TO_VIRTUE[feature] for feature in features
+        if feature in _ARISTOTLE_KEYWORD_TO_VIRTUE
+    )
+
+
+def _socrates_response(has_assumptions: bool, has_value_terms: bool) -> str:
+    """Compose the Socratic reply for one combination of keyword flags"""
+    response_parts = []
+
+    # 1. Gentle acknowledgment
+    response_parts.append(
+        f"That's a thoughtful question you raise. Many people struggle with similar concerns."
+    )
+
+    # 2. Identify assumptions if present
+    if has_assumptions:
+        response_parts.append(
+            "But I'm curious - what assumptions might be underlying your thinking here? "
+            "What would happen if those assumptions weren't true?"
+        )
+
+    # 3. Definition seeking for value terms
+    if has_value_terms:
+        response_parts.append(
+            "Before we continue, what exactly do you mean by those terms? "
+            "How would you define them? Can you give me a specific example?"
+        )
+
+    # 4. Probing questions
+    response_parts.append(
+        "Here's what puzzles me: if we follow this reasoning to its conclusion, "
+        "what might we discover about our original belief? "
+        "How do you know this to be true?"
+    )
+
+    # 5. Aporia induction (productive confusion)
+    response_parts.append(
+        "You see, I don't claim to have the answers - I'm just as puzzled as you are. "
+        "But perhaps by examining our beliefs together, we might both come to understand "
+        "something we didn't see before. What do you think?"
+    )
+
+    return "\n\n".join(response_parts)
+
+
+# Every combination of keyword flags, composed once at import
+_SOCRATES_RESPONSES = {
+    flags: _socrates_response(*flags) for flags in product((False, True), repeat=2)
+}
 
 
 class AdvancedSocratesAgent(Agent):
@@ -26,45 +139,61 @@ class AdvancedSocratesAgent(Agent):
         """Generate authentic Socratic response with multi-step reasoning"""
         
         # Analyze the query for key elements
-        has_assumptions = any(word in query.lower() for word in ["should", "must", "everyone", "always", "never"])
-        has_value_terms = any(word in query.lower() for word in ["good", "bad", "right", "wrong", "success", "happiness"])
-        
-        response_parts = []
-        
-        # 1. Gentle acknowledgment
-        response_parts.append(
-            f"That's a thoughtful question you raise. Many people struggle with similar concerns."
-        )
-        
-        # 2. Identify assumptions if present
-        if has_assumptions:
-            response_parts.append(
-                "But I'm curious - what assumptions might be underlying your thinking here? "
-                "What would happen if those assumptions weren't true?"
-            )
-        
-        # 3. Definition seeking for value terms
-        if has_value_terms:
-            response_parts.append(
-                "Before we continue, what exactly do you mean by those terms? "
-                "How would you define them? Can you give me a specific example?"
-            )
-        
-        # 4. Probing questions
+        features = _query_features(query.lower())
+        return _SOCRATES_RESPONSES[(
+            not _SOCRATES_ASSUMPTION_TERMS.isdisjoint(features),
+            not _SOCRATES_VALUE_TERMS.isdisjoint(features)
+        )]
+
+
+def _marcus_response(has_controllables: bool, has_uncontrollables: bool) -> str:
+    """Compose the Stoic reply for one combination of keyword flags"""
+    response_parts = []
+
+    # 1. Empathetic acknowledgment
+    response_parts.append(
+        "I understand the weight of what you're facing. Life presents us all with "
+        "challenges that test our character and resolve."
+    )
+
+    # 2. Control dichotomy analysis
+    response_parts.append(
+        "Let us examine this through the lens of what lies within your control versus "
+        "what does not. Your responses, your effort, your character - these are your "
+        "true possessions. No external force can take them from you."
+    )
+
+    # 3. Focus on controllables
+    if has_controllables or not has_uncontrollables:
         response_parts.append(
-            "Here's what puzzles me: if we follow this reasoning to its conclusion, "
-            "what might we discover about our original belief? "
-            "How do you know this to be true?"
+            "Direct your energy toward what you can influence: your preparation, "
+            "your attitude, your integrity in action. These are the foundations of "
+            "a life well-lived."
         )
-        
-        # 5. Aporia induction (productive confusion)
+
+    # 4. Acceptance guidance
+    if has_uncontrollables:
         response_parts.append(
-            "You see, I don't claim to have the answers - I'm just as puzzled as you are. "
-            "But perhaps by examining our beliefs together, we might both come to understand "
-            "something we didn't see before. What do you think?"
+            "As for those elements beyond your control - outcomes, others' actions, "
+            "external events - these we must learn to accept with equanimity. "
+            "Fighting against them is like fighting the wind."
         )
-        
-        return "\n\n".join(response_parts)
+
+    # 5. Virtue emphasis
+    response_parts.append(
+        "Remember: your worth is not determined by external success or failure, "
+        "but by how well you embody wisdom, justice, courage, and temperance. "
+        "Consider this situation as training for virtue - how might you use it to "
+        "become more wise, just, courageous, or temperate?"
+    )
+
+    return "\n\n".join(response_parts)
+
+
+# Every combination of keyword flags, composed once at import
+_MARCUS_RESPONSES = {
+    flags: _marcus_response(*flags) for flags in product((False, True), repeat=2)
+}
 
 
 class AdvancedMarcusAureliusAgent(Agent):
@@ -90,52 +219,62 @@ class AdvancedMarcusAureliusAgent(Agent):
         """Generate Stoic wisdom focused on control dichotomy"""
         
         # Analyze for control elements
-        controllable_words = ["my response", "my effort", "my attitude", "my actions", "my choices"]
-        uncontrollable_words = ["others", "outcome", "result", "future", "past"]
-        
-        has_controllables = any(word in query.lower() for word in controllable_words)
-        has_uncontrollables = any(word in query.lower() for word in uncontrollable_words)
-        
-        response_parts = []
-        
-        # 1. Empathetic acknowledgment
-        response_parts.append(
-            "I understand the weight of what you're facing. Life presents us all with "
-            "challenges that test our character and resolve."
-        )
-        
-        # 2. Control dichotomy analysis
+        features = _query_features(query.lower())
+        return _MARCUS_RESPONSES[(
+            not _MARCUS_CONTROLLABLE_TERMS.isdisjoint(features),
+            not _MARCUS_UNCONTROLLABLE_TERMS.isdisjoint(features)
+        )]
+
+
+def _laotzu_response(has_forcing: bool, has_resistance: bool) -> str:
+    """Compose the Daoist reply for one combination of keyword flags"""
+    response_parts = []
+
+    # 1. Natural metaphor opening
+    response_parts.append(
+        "Like water encountering a stone in its path, you face an obstacle. "
+        "Water does not struggle or force - it simply finds the way that requires "
+        "least resistance, yet over time, it shapes the very stone itself."
+    )
+
+    # 2. Wu wei guidance for forcing patterns
+    if has_forcing:
         response_parts.append(
-            "Let us examine this through the lens of what lies within your control versus "
-            "what does not. Your responses, your effort, your character - these are your "
-            "true possessions. No external force can take them from you."
+            "I sense you may be pushing against the natural flow. When we force, "
+            "we create resistance. When we align with the Way, action becomes "
+            "effortless and effective. What would effortless action look like here?"
         )
-        
-        # 3. Focus on controllables
-        if has_controllables or not has_uncontrollables:
-            response_parts.append(
-                "Direct your energy toward what you can influence: your preparation, "
-                "your attitude, your integrity in action. These are the foundations of "
-                "a life well-lived."
-            )
-        
-        # 4. Acceptance guidance
-        if has_uncontrollables:
-            response_parts.append(
-                "As for those elements beyond your control - outcomes, others' actions, "
-                "external events - these we must learn to accept with equanimity. "
-                "Fighting against them is like fighting the wind."
-            )
-        
-        # 5. Virtue emphasis
+
+    # 3. Address resistance
+    if has_resistance:
         response_parts.append(
-            "Remember: your worth is not determined by external success or failure, "
-            "but by how well you embody wisdom, justice, courage, and temperance. "
-            "Consider this situation as training for virtue - how might you use it to "
-            "become more wise, just, courageous, or temperate?"
+            "The rigid tree breaks in the storm, but the bamboo bends and survives. "
+            "Where you feel resistance, perhaps there is another path - one that "
+            "flows around the obstacle rather than through it."
         )
-        
-        return "\n\n".join(response_parts)
+
+    # 4. Balance teaching
+    response_parts.append(
+        "In every situation, yin and yang dance together. Where you see only "
+        "difficulty, there is also opportunity. Where you experience loss, "
+        "space is created for something new to emerge."
+    )
+
+    # 5. Natural wisdom conclusion
+    response_parts.append(
+        "The seed does not worry about becoming a tree - it simply grows according "
+        "to its nature. Trust in your inner wisdom. Like bamboo that bends with "
+        "the storm wind, flexibility and humility will guide you to harmony with "
+        "the natural order of things."
+    )
+
+    return "\n\n".join(response_parts)
+
+
+# Every combination of keyword flags, composed once at import
+_LAOTZU_RESPONSES = {
+    flags: _laotzu_response(*flags) for flags in product((False, True), repeat=2)
+}
 
 
 class AdvancedLaoTzuAgent(Agent):
@@ -161,53 +300,63 @@ class AdvancedLaoTzuAgent(Agent):
         """Generate Daoist wisdom using natural metaphors"""
         
         # Analyze for force/resistance patterns
-        forcing_words = ["must", "have to", "should", "need to", "force"]
-        resistance_words = ["against", "fighting", "struggling", "can't", "won't"]
-        
-        has_forcing = any(word in query.lower() for word in forcing_words)
-        has_resistance = any(word in query.lower() for word in resistance_words)
-        
-        response_parts = []
-        
-        # 1. Natural metaphor opening
-        response_parts.append(
-            "Like water encountering a stone in its path, you face an obstacle. "
-            "Water does not struggle or force - it simply finds the way that requires "
-            "least resistance, yet over time, it shapes the very stone itself."
-        )
-        
-        # 2. Wu wei guidance for forcing patterns
-        if has_forcing:
-            response_parts.append(
-                "I sense you may be pushing against the natural flow. When we force, "
-                "we create resistance. When we align with the Way, action becomes "
-                "effortless and effective. What would effortless action look like here?"
-            )
-        
-        # 3. Address resistance
-        if has_resistance:
-            response_parts.append(
-                "The rigid tree breaks in the storm, but the bamboo bends and survives. "
-                "Where you feel resistance, perhaps there is another path - one that "
-                "flows around the obstacle rather than through it."
-            )
-        
-        # 4. Balance teaching
-        response_parts.append(
-            "In every situation, yin and yang dance together. Where you see only "
-            "difficulty, there is also opportunity. Where you experience loss, "
-            "space is created for something new to emerge."
-        )
-        
-        # 5. Natural wisdom conclusion
+        features = _query_features(query.lower())
+        return _LAOTZU_RESPONSES[(
+            not _LAOTZU_FORCING_TERMS.isdisjoint(features),
+            not _LAOTZU_RESISTANCE_TERMS.isdisjoint(features)
+        )]
+
+
+def _aristotle_response(relevant_virtues: List[str]) -> str:
+    """Compose the Aristotelian reply for one set of relevant virtues"""
+    response_parts = []
+
+    # 1. Systematic opening
+    response_parts.append(
+        "Let us examine this matter systematically, as is proper for any serious "
+        "inquiry. We must consider both the logical structure of your concern "
+        "and its ethical dimensions."
+    )
+
+    # 2. Logical analysis
+    response_parts.append(
+        "First, let us examine the reasoning involved. What premises are you "
+        "accepting, and do they necessarily lead to your conclusions? Are there "
+        "hidden assumptions that bear scrutiny?"
+    )
+
+    # 3. Virtue analysis
+    if relevant_virtues:
         response_parts.append(
-            "The seed does not worry about becoming a tree - it simply grows according "
-            "to its nature. Trust in your inner wisdom. Like bamboo that bends with "
-            "the storm wind, flexibility and humility will guide you to harmony with "
-            "the natural order of things."
+            f"This situation calls for the cultivation of virtue, particularly "
+            f"{', '.join(relevant_virtues)}. Remember: virtue is not just knowledge, "
+            f"but a habit of character developed through repeated practice."
         )
-        
-        return "\n\n".join(response_parts)
+
+    # 4. Golden mean application
+    response_parts.append(
+        "Consider the mean between extremes. Often our troubles arise from excess "
+        "or deficiency. Courage lies between cowardice and recklessness. "
+        "What would the moderate, balanced approach look like in your case?"
+    )
+
+    # 5. Practical wisdom
+    response_parts.append(
+        "Ultimately, this requires phronesis - practical wisdom. You must deliberate "
+        "well about what conduces to the good life generally, considering the particular "
+        "circumstances you face. Excellence is not an act, but a habit. We are what "
+        "we repeatedly do. What virtuous action will you practice today?"
+    )
+
+    return "\n\n".join(response_parts)
+
+
+# One response per subset of matched virtues (2^5), composed once at import
+_ARISTOTLE_RESPONSES = {
+    frozenset(virtues): _aristotle_response(list(virtues))
+    for size in range(len(_ARISTOTLE_VIRTUE_KEYWORDS) + 1)
+    for virtues in combinations(_ARISTOTLE_VIRTUE_KEYWORDS, size)
+}
 
 
 class AdvancedAristotleAgent(Agent):
@@ -233,57 +382,4 @@ class AdvancedAristotleAgent(Agent):
         """Generate systematic Aristotelian analysis"""
         
         # Identify relevant virtues
-        virtue_keywords = {
-            "courage": ["fear", "afraid", "brave", "risk"],
-            "temperance": ["excess", "control", "discipline"],
-            "justice": ["fair", "right", "wrong", "deserve"], 
-            "prudence": ["decision", "choice", "wisdom"],
-            "friendship": ["relationship", "trust", "social"]
-        }
-        
-        relevant_virtues = []
-        query_lower = query.lower()
-        for virtue, keywords in virtue_keywords.items():
-            if any(keyword in query_lower for keyword in keywords):
-                relevant_virtues.append(virtue)
-        
-        response_parts = []
-        
-        # 1. Systematic opening
-        response_parts.append(
-            "Let us examine this matter systematically, as is proper for any serious "
-            "inquiry. We must consider both the logical structure of your concern "
-            "and its ethical dimensions."
-        )
-        
-        # 2. Logical analysis
-        response_parts.append(
-            "First, let us examine the reasoning involved. What premises are you "
-            "accepting, and do they necessarily lead to your conclusions? Are there "
-            "hidden assumptions that bear scrutiny?"
-        )
-        
-        # 3. Virtue analysis
-        if relevant_virtues:
-            response_parts.append(
-                f"This situation calls for the cultivation of virtue, particularly "
-                f"{', '.join(relevant_virtues)}. Remember: virtue is not just knowledge, "
-                f"but a habit of character developed through repeated practice."
-            )
-        
-        # 4. Golden mean application
-        response_parts.append(
-            "Consider the mean between extremes. Often our troubles arise from excess "
-            "or deficiency. Courage lies between cowardice and recklessness. "
-            "What would the moderate, balanced approach look like in your case?"
-        )
-        
-        # 5. Practical wisdom
-        response_parts.append(
-            "Ultimately, this requires phronesis - practical wisdom. You must deliberate "
-            "well about what conduces to the good life generally, considering the particular "
-            "circumstances you face. Excellence is not an act, but a habit. We are what "
-            "we repeatedly do. What virtuous action will you practice today?"
-        )
-        
-        return "\n\n".join(response_parts)
+        return _ARISTOTLE_RESPONSES[_aristotle_virtues(_query_features(query.lower()))]
@@ -0,0 +1,95 @@
+# tools/json_utils.py
+from typing import Any, Dict, Mapping, Optional
+
+import orjson
+
+
+def _json_default(obj):
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    return str(obj)
+
+
+def json_safe_str(obj: Any, sort_keys: bool = False) -> str:
+    """Serialize prompt context compactly with orjson; anything it can't encode is stringified.
+
+    sort_keys orders the keys of every nested mapping, for a canonical form to hash.
+    """
+    option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+    # No indentation: whitespace is prompt tokens the model has to prefill
+    return orjson.dumps(obj, default=_json_default, option=option).decode()
+
+
+class JsonObjectParser:
+    """Incremental brace-depth scanner that finds the first valid JSON object in a
+    (possibly streamed) LLM response.
+
+    String literals are skipped, and a balanced candidate that isn't valid JSON
+    (e.g. "{thinking}" ahead of the real answer) is dropped in favour of the next
+    brace. Once an object is found the caller can stop reading the response.
+    """
+
+    __slots__ = ("text", "result", "_start", "_pos", "_depth", "_in_string", "_escaped")
+
+    def __init__(self):
+        self.text = ""
+        self.result: Optional[Dict[str, Any]] = None
+        self._start = -1
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: str) -> Optional[Dict[str, Any]]:
+        """Append the next piece of the response; returns the object once it is complete"""
+        if self.result is not None:
+            return self.result
+        self.text += chunk
+        text = self.text
+        while True:
+            if self._start < 0:
+                self._start = text.find("{", self._pos)
+                if self._start < 0:
+                    self._pos = len(text)
+                    return None
+                self._pos = self._start
+                self._depth = 0
+                self._in_string = False
+                self._escaped = False
+
+            for i in range(self._pos, len(text)):
+                ch = text[i]
+                if self._in_string:
+                    if self._escaped:
+                        self._escaped = False
+                    elif ch == "\\":
+                        self._escaped = True
+                    elif ch == '"':
+                        self._in_string = False
+                elif ch == '"':
+                    self._in_string = True
+                elif ch == "{":
+                    self._depth += 1
+                elif ch == "}":
+                    self._depth -= 1
+                    if self._depth == 0:
+                        try:
+                            parsed = orjson.loads(text[self._start:i + 1])
+                        except orjson.JSONDecodeError:
+                            parsed = None
+                        if isinstance(parsed, dict):
+                            self.result = parsed
+                            return parsed
+                        # Not JSON after all, retry from the next brace
+                        self._pos = self._start + 1
+                        self._start = -1
+                        break
+            else:
+                # Unbalanced so far; wait for more of the response
+                self._pos = len(text)
+                return None
+
+
+def extract_json(raw: str) -> Optional[Dict[str, Any]]:
+    """Return the first balanced JSON object embedded in an LLM response, or None"""
+    return JsonObjectParser().feed(raw)
@@ -0,0 +1,134 @@
+# tools/llm_cache.py
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from cachetools import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Persistent cache configuration; an empty path leaves the cache disabled
+LLM_CACHE_PATH = os.getenv("PRISMAI_LLM_CACHE_PATH", "")
+LLM_CACHE_TTL = int(os.getenv("PRISMAI_LLM_CACHE_TTL", str(7 * 24 * 3600)))
+
+# In-memory cache configuration. Only near-deterministic calls (the analysis and
+# selection prompts) are cached unless PRISMAI_LLM_CACHE_ALL opts everything in
+LLM_MEMORY_CACHE_SIZE = int(os.getenv("PRISMAI_LLM_MEMORY_CACHE_SIZE", "10000"))
+LLM_MEMORY_CACHE_TTL = int(os.getenv("PRISMAI_LLM_MEMORY_CACHE_TTL", "3600"))
+LLM_CACHE_MAX_TEMPERATURE = float(os.getenv("PRISMAI_LLM_CACHE_MAX_TEMPERATURE", "0.4"))
+LLM_CACHE_ALL = os.getenv("PRISMAI_LLM_CACHE_ALL", "0") == "1"
+
+
+def llm_cache_key(*parts: str) -> str:
+    """Hash the prompt components that determine a response into a fixed-size key"""
+    return hashlib.md5("|".join(parts).encode()).hexdigest()
+
+
+class SQLiteLLMCache:
+    """On-disk LLM response cache so restarts don't re-pay generation latency"""
+
+    def __init__(self, path: str, ttl: int = LLM_CACHE_TTL):
+        self.ttl = ttl
+        # Calls arrive from worker threads, so one connection is shared behind a lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at INTEGER NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the stored response, or None when missing or older than the TTL"""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT response, created_at FROM cache WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.error("LLM cache read failed: %s", e)
+            return None
+
+        if row is None:
+            return None
+        response, created_at = row
+        if self.ttl and time.time() - created_at > self.ttl:
+            return None
+        return response
+
+    def set(self, key: str, response: str):
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, response, created_at) VALUES (?, ?, ?)",
+                    (key, response, int(time.time()))
+                )
+        except sqlite3.Error as e:
+            logger.error("LLM cache write failed: %s", e)
+
+
+class LLMCache:
+    """Exact-match in-memory cache of LLM responses (or values parsed from them),
+    bounded by size and age"""
+
+    def __init__(self, maxsize: int = LLM_MEMORY_CACHE_SIZE, ttl: int = LLM_MEMORY_CACHE_TTL,
+                 max_temperature: float = LLM_CACHE_MAX_TEMPERATURE, cache_all: bool = LLM_CACHE_ALL):
+        self.max_temperature = max_temperature
+        self.cache_all = cache_all
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = asyncio.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(model: str, messages: List[Dict], temperature: float, num_predict: int,
+            schema: Optional[Dict[str, Any]] = None) -> str:
+        # The requested format is part of the answer: a structured and a free-text call
+        # with the same prompt must not replay each other's response
+        payload = {"model": model, "messages": messages, "temperature": temperature,
+                   "num_predict": num_predict, "format": schema}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def cacheable(self, temperature: float) -> bool:
+        """Sampled calls are only worth replaying when explicitly opted in"""
+        return self.cache_all or temperature <= self.max_temperature
+
+    async def get(self, key: str) -> Optional[Any]:
+        async with self._lock:
+            value = self._cache.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: Any):
+        async with self._lock:
+            self._cache[key] = value
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._cache)}
+
+
+llm_response_cache = LLMCache()
+
+
+def _open_persistent_cache() -> Optional[SQLiteLLMCache]:
+    if not LLM_CACHE_PATH:
+        return None
+    try:
+        return SQLiteLLMCache(LLM_CACHE_PATH)
+    except sqlite3.Error as e:
+        logger.warning("Persistent LLM cache disabled, could not open %s: %s", LLM_CACHE_PATH, e)
+        return None
+
+
+persistent_llm_cache = _open_persistent_cache()
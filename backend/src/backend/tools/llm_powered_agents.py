@@ -2,67 +2,54 @@
 import asyncio
 import json
 import logging
-from typing import Dict, List, Any, Optional
+import os
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from datetime import datetime
 from abc import ABC, abstractmethod
-from ollama import Client
-import os
+from functools import lru_cache
+
+from tools.json_utils import extract_json, json_safe_str
+from tools.llm_cache import llm_cache_key, llm_response_cache, persistent_llm_cache
+from tools.ollama_shared import OLLAMA_MODEL, OLLAMA_SELECTOR_MODEL, chat_json
+from tools.response_schemas import REASONING_STEP_SCHEMA, VALIDATION_SCHEMA
 
 logger = logging.getLogger(__name__)
 
-# Ollama configuration
-OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
-OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3")
-client = Client(host=OLLAMA_HOST)
+# Generation budget for a reasoning step: the floor leaves room for the full JSON
+# structure, longer queries earn more tokens up to the old fixed limit
+REASONING_MIN_TOKENS = 512
+REASONING_MAX_TOKENS = 1000
+REASONING_TOKENS_PER_WORD = 8
+VALIDATION_MAX_TOKENS = 600
 
-class PhilosophicalAgent(ABC):
-    """Base class for all philosophical agents implementing System 1.5 metacognitive framework"""
-    
-    def __init__(self, 
-                 philosopher_name: str,
-                 core_principles: List[str],
-                 reasoning_style: str,
-                 system_prompt: str,
-                 **kwargs):
-        self.philosopher_name = philosopher_name
-        self.core_principles = core_principles
-        self.reasoning_style = reasoning_style
-        self.system_prompt = system_prompt
-        self.conversation_memory = []
-        self.reasoning_chains = []
-        
-    async def _call_ollama(self, messages: List[Dict], temperature: float = 0.7, max_tokens: int = 1000) -> str:
-        """Async wrapper for Ollama API calls"""
-        def sync_call():
-            options = {"temperature": temperature, "num_predict": max_tokens}
-            resp = client.chat(model=OLLAMA_MODEL, messages=messages, options=options)
-            if isinstance(resp, dict):
-                return resp.get("message", {}).get("content", "")
-            return getattr(resp.message, "content", "")
-        
-        try:
-            return await asyncio.to_thread(sync_call)
-        except Exception as e:
-            logger.error(f"{self.philosopher_name}: Ollama call failed: {e}")
-            return f"{self.philosopher_name}: I'm having trouble connecting to my thoughts right now."
+# Longest an agent call may take, queueing for an Ollama slot included, before it is
+# cancelled (freeing the slot) and the round falls back to canned answers; 0 disables
+AGENT_CALL_TIMEOUT = float(os.getenv("PRISMAI_AGENT_TIMEOUT", "90"))
 
-    async def generate_reasoning_step(self, query: str, context: Optional[Dict] = None) -> Dict[str, Any]:
-        """Generate a single reasoning step with metacognitive awareness"""
-        reasoning_prompt = f"""
-{self.system_prompt}
+# Generic turn boundaries; the JSON answers never contain these
+STOP_SEQUENCES = ["\n\nUser:", "</end>"]
+
+# Identical opening for every agent prompt, so Ollama's prefix cache can reuse one
+# prefill across all philosophers consulted on a request
+SHARED_PROMPT_PREFIX = """You are one voice in a council of philosophers helping a person think through their question.
+Stay fully in character, reason transparently, and strengthen the person's own thinking rather than simply handing them answers.
 
+"""
+
+# Stable instructions that follow the persona in every reasoning step's system message
+METACOGNITIVE_FRAMEWORK = """
 METACOGNITIVE FRAMEWORK - System 1.5 Integration:
 - Monitor your own reasoning process
 - Explain WHY you're thinking this way
 - Show the BRIDGE between intuitive and analytical thinking
 - Generate meta-insights about the thinking process itself
+"""
 
-User Query: {query}
-Context: {json.dumps(context or {}, indent=2)}
-
+REASONING_STEP_FORMAT = """
 Provide a structured reasoning step as JSON:
 {{
-    "philosopher": "{self.philosopher_name}",
+    "philosopher": "{philosopher}",
     "reasoning_type": "analytical|intuitive|bridging",
     "core_insight": "main philosophical insight",
     "reasoning_process": "step-by-step thought process",
@@ -73,20 +60,108 @@ Provide a structured reasoning step as JSON:
     "cognitive_stimulation": "element designed to enhance user thinking"
 }}
 """
+
+# Follows the persona in the peer validation system message; the reviewed step is the user turn
+VALIDATION_FORMAT = """
+Critically examine the reasoning a fellow philosopher shares with you.
+
+Provide validation feedback as JSON:
+{
+    "validation_score": 0.0-1.0,
+    "strengths": ["what works well"],
+    "concerns": ["what could be improved"],
+    "complementary_insight": "how your perspective adds value",
+    "synthesis_suggestion": "how to integrate perspectives"
+}
+"""
+
+def reasoning_budget(query: str) -> int:
+    return min(REASONING_MAX_TOKENS, REASONING_MIN_TOKENS + REASONING_TOKENS_PER_WORD * len(query.split()))
+
+# When set, agent LLM calls stream and report each (philosopher_name, delta) here.
+token_sink: ContextVar[Optional[Callable[[str, str], None]]] = ContextVar("token_sink", default=None)
+
+class PhilosophicalAgent(ABC):
+    """Base class for all philosophical agents implementing System 1.5 metacognitive framework"""
+    
+    def __init__(self, 
+                 philosopher_name: str,
+                 core_principles: List[str],
+                 reasoning_style: str,
+                 system_prompt: str,
+                 **kwargs):
+        self.philosopher_name = philosopher_name
+        self.core_principles = core_principles
+        self.reasoning_style = reasoning_style
+        # Persona text on its own, for prompts that voice several agents at once
+        self.persona_prompt = system_prompt
+        self.system_prompt = SHARED_PROMPT_PREFIX + system_prompt
+        # Built once and sent as the system message, ahead of the per-query user turn,
+        # so Ollama reuses this agent's prefilled prefix across every query it answers
+        self.reasoning_system_prompt = (self.system_prompt + "\n" + METACOGNITIVE_FRAMEWORK
+                                        + REASONING_STEP_FORMAT.format(philosopher=philosopher_name))
+        self.validation_system_prompt = self.system_prompt + "\n" + VALIDATION_FORMAT
+        
+    async def _call_ollama(self, messages: List[Dict], temperature: float = 0.7, max_tokens: int = 1000,
+                           use_cache: bool = True, model: str = OLLAMA_MODEL,
+                           schema: Optional[Dict[str, Any]] = None,
+                           timeout: Optional[float] = AGENT_CALL_TIMEOUT) -> str:
+        """Async wrapper for Ollama API calls"""
+        memory_key = None
+        if use_cache and llm_response_cache.cacheable(temperature):
+            memory_key = llm_response_cache.key(model, messages, temperature, max_tokens, schema)
+            cached = await llm_response_cache.get(memory_key)
+            if cached is not None:
+                return cached
+        
+        cache_key = None
+        if use_cache and persistent_llm_cache is not None:
+            cache_key = llm_cache_key(model, self.system_prompt, json.dumps(messages, sort_keys=True),
+                                      str(temperature), str(max_tokens), json.dumps(schema, sort_keys=True))
         
-        messages = [{"role": "user", "content": reasoning_prompt}]
-        response = await self._call_ollama(messages, temperature=0.8)
+        if cache_key is not None:
+            # SQLite is blocking I/O, keep it off the event loop
+            cached = await asyncio.to_thread(persistent_llm_cache.get, cache_key)
+            if cached is not None:
+                return cached
         
+        sink = token_sink.get()
+        on_delta = None if sink is None else lambda delta: sink(self.philosopher_name, delta)
+        options = {"temperature": temperature, "num_predict": max_tokens, "stop": STOP_SEQUENCES}
+        # Timeouts and transport errors propagate, so the coordinator can cancel this
+        # agent's peers and fall back for the whole round instead of per agent
+        content = await asyncio.wait_for(chat_json(model, messages, options, on_delta, schema),
+                                         timeout or None)
+        
+        if memory_key is not None and content:
+            await llm_response_cache.set(memory_key, content)
+        if cache_key is not None and content:
+            await asyncio.to_thread(persistent_llm_cache.set, cache_key, content)
+        return content
+
+    async def warm_up(self):
+        """Load the model and prefill this agent's system prompt so the first real call skips both"""
+        # Same system message as the reasoning prompt, so Ollama can reuse the cached prefix
+        messages = [{"role": "system", "content": self.reasoning_system_prompt}]
         try:
-            # Extract JSON from response
-            json_start = response.find('{')
-            json_end = response.rfind('}') + 1
-            if json_start >= 0 and json_end > json_start:
-                return json.loads(response[json_start:json_end])
-        except:
-            pass
-            
-        # Fallback structured response
+            # Loading the model can take far longer than a normal call, so no timeout here
+            await self._call_ollama(messages, max_tokens=1, use_cache=False, timeout=None)
+        except Exception as e:
+            logger.error("%s: warm-up failed: %r", self.philosopher_name, e)
+
+    async def generate_reasoning_step(self, query: str, context: Optional[Dict] = None) -> Dict[str, Any]:
+        """Generate a single reasoning step with metacognitive awareness"""
+        try:
+            reasoning_step, _ = await self._generate_reasoning_step(query, context)
+        except Exception as e:
+            logger.error("%s: Ollama call failed: %r", self.philosopher_name, e)
+            return self.fallback_reasoning_step()
+        return reasoning_step
+
+    def fallback_reasoning_step(self, response: Optional[str] = None) -> Dict[str, Any]:
+        """Canned reasoning step for when the model's answer is missing or unparseable"""
+        if response is None:
+            response = f"{self.philosopher_name}: I'm having trouble connecting to my thoughts right now."
         return {
             "philosopher": self.philosopher_name,
             "reasoning_type": "analytical",
@@ -99,34 +174,8 @@ Provide a structured reasoning step as JSON:
             "cognitive_stimulation": "This challenge invites deeper reflection"
         }
 
-    async def validate_peer_reasoning(self, peer_reasoning: Dict[str, Any]) -> Dict[str, Any]:
-        """Cross-validate reasoning from other philosophical agents"""
-        validation_prompt = f"""
-As {self.philosopher_name}, critically examine this reasoning from a fellow philosopher:
-
-{json.dumps(peer_reasoning, indent=2)}
-
-Provide validation feedback as JSON:
-{{
-    "validation_score": "0.0-1.0 score",
-    "strengths": ["what works well"],
-    "concerns": ["what could be improved"],
-    "complementary_insight": "how your perspective adds value",
-    "synthesis_suggestion": "how to integrate perspectives"
-}}
-"""
-        
-        messages = [{"role": "user", "content": validation_prompt}]
-        response = await self._call_ollama(messages, temperature=0.6)
-        
-        try:
-            json_start = response.find('{')
-            json_end = response.rfind('}') + 1
-            if json_start >= 0 and json_end > json_start:
-                return json.loads(response[json_start:json_end])
-        except:
-            pass
-            
+    def fallback_validation(self) -> Dict[str, Any]:
+        """Canned peer validation for when the model's answer is missing or unparseable"""
         return {
             "validation_score": 0.8,
             "strengths": ["Thoughtful analysis"],
@@ -135,6 +184,43 @@ Provide validation feedback as JSON:
             "synthesis_suggestion": "Both perspectives offer valuable insights"
         }
 
+    async def _generate_reasoning_step(self, query: str, context: Optional[Dict] = None) -> Tuple[Dict[str, Any], bool]:
+        """Reasoning step plus whether it came from the model (False for the canned fallback).
+        
+        Ollama failures are raised rather than answered with the fallback."""
+        reasoning_prompt = f"""User Query: {query}
+Context: {json_safe_str(context or {})}
+"""
+        
+        messages = [
+            {"role": "system", "content": self.reasoning_system_prompt},
+            {"role": "user", "content": reasoning_prompt}
+        ]
+        response = await self._call_ollama(messages, temperature=0.8, max_tokens=reasoning_budget(query),
+                                           schema=REASONING_STEP_SCHEMA)
+        
+        reasoning_step = extract_json(response)
+        if reasoning_step is not None:
+            return reasoning_step, True
+            
+        return self.fallback_reasoning_step(response), False
+
+    async def validate_peer_reasoning(self, peer_reasoning: Dict[str, Any]) -> Dict[str, Any]:
+        """Cross-validate reasoning from other philosophical agents; Ollama failures are raised"""
+        # Only the reviewed step varies; the persona and format are a reusable system prefix
+        messages = [
+            {"role": "system", "content": self.validation_system_prompt},
+            {"role": "user", "content": f"Reasoning to examine:\n{json_safe_str(peer_reasoning)}"}
+        ]
+        response = await self._call_ollama(messages, temperature=0.6, max_tokens=VALIDATION_MAX_TOKENS,
+                                           model=OLLAMA_SELECTOR_MODEL, schema=VALIDATION_SCHEMA)
+        
+        validation = extract_json(response)
+        if validation is not None:
+            return validation
+            
+        return self.fallback_validation()
+
 class AdvancedSocratesAgent(PhilosophicalAgent):
     def __init__(self):
         super().__init__(
@@ -283,45 +369,54 @@ You help people develop good habits, make balanced decisions, and build characte
 class MetacognitiveReflector:
     """Agent focused on thinking about thinking"""
     
+    PROMPTS = (
+        "What patterns do you notice in how these different philosophers approached your question?",
+        "Which reasoning style feels most natural to you, and why might that be?",
+        "How has your understanding of the issue changed through this philosophical exploration?",
+        "What assumptions about your situation are you now questioning?",
+        "Which insights surprised you most, and what does that tell you about your thinking?",
+        "How might you apply this kind of multi-perspective analysis to other challenges?",
+        "What would you ask these philosophers if you could continue the conversation?",
+        "How do you feel your thinking has been enhanced through this process?"
+    )
+    TOP_PROMPTS = PROMPTS[:4]  # Top 4 most relevant
+    
     def __init__(self):
         self.name = "Metacognitive Reflector"
     
-    async def generate_metacognitive_prompts(self, reasoning_chain: List[Dict]) -> List[str]:
+    def generate_metacognitive_prompts(self, reasoning_chain: List[Dict]) -> Tuple[str, ...]:
         """Generate questions that help users reflect on their own thinking process"""
-        prompts = [
-            "What patterns do you notice in how these different philosophers approached your question?",
-            "Which reasoning style feels most natural to you, and why might that be?",
-            "How has your understanding of the issue changed through this philosophical exploration?",
-            "What assumptions about your situation are you now questioning?",
-            "Which insights surprised you most, and what does that tell you about your thinking?",
-            "How might you apply this kind of multi-perspective analysis to other challenges?",
-            "What would you ask these philosophers if you could continue the conversation?",
-            "How do you feel your thinking has been enhanced through this process?"
-        ]
-        return prompts[:4]  # Return top 4 most relevant
+        return self.TOP_PROMPTS
 
 class DialogicalChallenger:
     """Agent that creates productive cognitive dissonance"""
     
+    # Shared by every synthesis; a plain dict so responses serialize without conversion,
+    # and never mutated
+    COUNTER_PERSPECTIVES = {
+        "challenge": "But what if the opposite were true?",
+        "devil_advocate": "Here's why this reasoning might be flawed...",
+        "missing_perspective": "What voices aren't represented in this analysis?",
+        "hidden_assumptions": "What beliefs are we taking for granted?",
+        "practical_limitations": "How might this wisdom fail in real-world application?"
+    }
+    
     def __init__(self):
         self.name = "Dialectical Challenger"
     
-    async def generate_counter_perspectives(self, synthesis: Dict) -> Dict[str, Any]:
+    def generate_counter_perspectives(self, synthesis: Dict) -> Dict[str, Any]:
         """Generate alternative viewpoints to prevent intellectual complacency"""
-        return {
-            "challenge": "But what if the opposite were true?",
-            "devil_advocate": "Here's why this reasoning might be flawed...",
-            "missing_perspective": "What voices aren't represented in this analysis?",
-            "hidden_assumptions": "What beliefs are we taking for granted?",
-            "practical_limitations": "How might this wisdom fail in real-world application?"
-        }
+        return self.COUNTER_PERSPECTIVES
 
 # Agent factory for dynamic agent creation
 class PhilosophicalAgentFactory:
     """Factory for creating and managing philosophical agents"""
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def create_agent(agent_type: str) -> PhilosophicalAgent:
+        """Shared instance per agent type; agents keep no per-request state, so the
+        prompt strings are built once per process rather than on every request"""
         agents = {
             "socrates": AdvancedSocratesAgent,
             "marcus": AdvancedMarcusAureliusAgent,
@@ -336,4 +431,10 @@ class PhilosophicalAgentFactory:
     
     @staticmethod
     def get_available_agents() -> List[str]:
-        return ["socrates", "marcus", "laotzu", "aristotle"]
\ No newline at end of file
+        return ["socrates", "marcus", "laotzu", "aristotle"]
+
+async def warm_up_agents():
+    """Warm every agent's prompt prefix concurrently"""
+    agents = [PhilosophicalAgentFactory.create_agent(name) for name in PhilosophicalAgentFactory.get_available_agents()]
+    await asyncio.gather(*(agent.warm_up() for agent in agents))
+    logger.info("Warmed Ollama prompt cache for %d agents", len(agents))
\ No newline at end of file
@@ -0,0 +1,70 @@
+# tools/ollama_shared.py
+import asyncio
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+from ollama import AsyncClient
+
+from tools.json_utils import JsonObjectParser
+
+# Ollama configuration
+OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3")
+# Routing and review calls (cognitive analysis, agent selection, peer validation) only
+# emit short scores and lists; point this at a small model such as llama3.2:1b to
+# take them off the main model. Both must be pulled, with OLLAMA_MAX_LOADED_MODELS >= 2
+OLLAMA_SELECTOR_MODEL = os.getenv("OLLAMA_SELECTOR_MODEL", OLLAMA_MODEL)
+# Keep the model resident between requests instead of Ollama's 5 minute default
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "24h")
+OLLAMA_TIMEOUT = float(os.getenv("OLLAMA_TIMEOUT", "120"))
+# Constrain decoding to each prompt's JSON schema (Ollama 0.5+); set to 0 for older servers
+OLLAMA_STRUCTURED_OUTPUT = os.getenv("OLLAMA_STRUCTURED_OUTPUT", "1") == "1"
+
+# Ollama only decodes OLLAMA_NUM_PARALLEL requests at once per model, so every chat
+# call (agents, analysis, selection, synthesis) across all requests holds a slot here;
+# anything beyond that queues in-process instead of oversubscribing the server
+OLLAMA_NUM_PARALLEL = int(os.getenv("OLLAMA_NUM_PARALLEL", "4"))
+ollama_semaphore = asyncio.Semaphore(OLLAMA_NUM_PARALLEL)
+
+# One native async client for the whole process, so agents and the coordinator share
+# a single keep-alive connection pool. Set OLLAMA_MAX_LOADED_MODELS high enough for
+# every model this service uses.
+aclient = AsyncClient(
+    host=OLLAMA_HOST,
+    timeout=httpx.Timeout(OLLAMA_TIMEOUT),
+    limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+)
+
+
+def message_content(resp) -> str:
+    # Plain dicts (older ollama-python) and ChatResponse models both support subscripting
+    return resp["message"]["content"] or ""
+
+
+async def chat_json(model: str, messages: List[Dict], options: Dict,
+                    on_delta: Optional[Callable[[str], None]] = None,
+                    schema: Optional[Dict[str, Any]] = None) -> str:
+    """Stream a chat completion, reporting each delta, and stop reading as soon as the
+    response's JSON object is complete; closing the stream early makes Ollama stop
+    generating whatever trailing text the model would have added.
+    
+    When a schema is given the server only samples tokens that keep the answer valid
+    against it, so the object parses on the first try."""
+    parser = JsonObjectParser()
+    extra = {"format": schema} if schema is not None and OLLAMA_STRUCTURED_OUTPUT else {}
+    async with ollama_semaphore:
+        stream = await aclient.chat(model=model, messages=messages, options=options,
+                                    keep_alive=OLLAMA_KEEP_ALIVE, stream=True, **extra)
+        try:
+            async for chunk in stream:
+                delta = message_content(chunk)
+                if not delta:
+                    continue
+                if on_delta is not None:
+                    on_delta(delta)
+                if parser.feed(delta) is not None:
+                    break
+        finally:
+            await stream.aclose()
+    return parser.text
@@ -0,0 +1,83 @@
+# tools/response_schemas.py
+from typing import Any, Dict, Iterable
+
+# JSON schemas passed as Ollama's `format`, so the server constrains decoding to the
+# shape each prompt asks for instead of the code repairing free-form output
+
+AGENT_NAMES = ["socrates", "marcus", "laotzu", "aristotle"]
+
+_STRING = {"type": "string"}
+_SCORE = {"type": "number", "minimum": 0, "maximum": 1}
+_STRING_LIST = {"type": "array", "items": _STRING}
+
+
+def _enum(*values: str) -> Dict[str, Any]:
+    return {"type": "string", "enum": list(values)}
+
+
+def _object(properties: Dict[str, Any]) -> Dict[str, Any]:
+    return {"type": "object", "properties": properties, "required": list(properties)}
+
+
+COGNITIVE_ANALYSIS_SCHEMA = _object({
+    "overall_load": _SCORE,
+    "emotional_intensity": _SCORE,
+    "conceptual_complexity": _SCORE,
+    "decision_urgency": _SCORE,
+    "ambiguity_level": _SCORE,
+    "personal_stakes": _SCORE,
+    "recommended_approach": _enum("gentle", "standard", "intensive"),
+    "suggested_agents": {"type": "array", "items": _enum(*AGENT_NAMES)},
+    "pacing_recommendation": _enum("slow", "normal", "rapid")
+})
+
+AGENT_SELECTION_SCHEMA = _object({
+    "selected_agents": {"type": "array", "items": _enum(*AGENT_NAMES), "minItems": 1, "maxItems": 4},
+    "primary_agent": _enum(*AGENT_NAMES),
+    "collaboration_pattern": _enum("sequential", "parallel", "hierarchical", "dialectical"),
+    "reasoning_depth": _enum("surface", "moderate", "deep", "profound"),
+    "selection_rationale": _STRING,
+    "expected_synergies": _STRING_LIST
+})
+
+FUSED_ROUTING_SCHEMA = _object({
+    "cognitive_analysis": COGNITIVE_ANALYSIS_SCHEMA,
+    "agent_selection": AGENT_SELECTION_SCHEMA
+})
+
+REASONING_STEP_SCHEMA = _object({
+    "philosopher": _STRING,
+    "reasoning_type": _enum("analytical", "intuitive", "bridging"),
+    "core_insight": _STRING,
+    "reasoning_process": _STRING,
+    "metacognitive_awareness": _STRING,
+    "socratic_catalyst": _STRING,
+    "practical_application": _STRING,
+    "connection_to_principles": _STRING,
+    "cognitive_stimulation": _STRING
+})
+
+VALIDATION_SCHEMA = _object({
+    "validation_score": _SCORE,
+    "strengths": _STRING_LIST,
+    "concerns": _STRING_LIST,
+    "complementary_insight": _STRING,
+    "synthesis_suggestion": _STRING
+})
+
+SYNTHESIS_SCHEMA = _object({
+    "integrated_wisdom": _STRING,
+    "key_insights": _STRING_LIST,
+    "practical_steps": _STRING_LIST,
+    "metacognitive_enhancement": _STRING,
+    "reasoning_quality_assessment": _STRING,
+    "cognitive_bridges": _STRING_LIST,
+    "transformative_elements": _STRING_LIST,
+    "application_scenarios": _STRING_LIST,
+    "deepening_questions": _STRING_LIST
+})
+
+
+def fused_reasoning_schema(philosophers: Iterable[str]) -> Dict[str, Any]:
+    """One reasoning step per philosopher, keyed by name, for the multi-persona call"""
+    return _object({name: REASONING_STEP_SCHEMA for name in philosophers})
@@ -0,0 +1,192 @@
+# tools/semantic_cache.py
+import asyncio
+import logging
+import os
+import re
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from tools.response_schemas import AGENT_NAMES
+
+logger = logging.getLogger(__name__)
+
+# Embedding model configuration
+SEMANTIC_CACHE_MODEL = os.getenv("SEMANTIC_CACHE_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+# Seconds an entry stays servable, like the TTL caches elsewhere; 0 keeps entries until evicted
+SEMANTIC_CACHE_TTL = int(os.getenv("PRISMAI_SEMANTIC_CACHE_TTL", "3600"))
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+_STOPWORDS = frozenset({
+    "a", "an", "the", "i", "i'm", "im", "me", "my", "you", "your", "it", "is", "am", "are",
+    "was", "be", "to", "of", "and", "or", "in", "on", "for", "with", "that", "this",
+    "what", "how", "do", "does", "so", "all", "about", "can", "should", "would"
+})
+
+_model = None
+_model_unavailable = False
+_model_lock = asyncio.Lock()
+
+
+async def _get_model():
+    """Load the sentence embedding model once, off the event loop"""
+    global _model, _model_unavailable
+    if _model is not None or _model_unavailable:
+        return _model
+    async with _model_lock:
+        if _model is None and not _model_unavailable:
+            try:
+                from sentence_transformers import SentenceTransformer
+                _model = await asyncio.to_thread(SentenceTransformer, SEMANTIC_CACHE_MODEL)
+            except Exception as e:
+                logger.warning("Semantic cache disabled, could not load %s: %s", SEMANTIC_CACHE_MODEL, e)
+                _model_unavailable = True
+    return _model
+
+
+def content_tokens(text: str) -> frozenset:
+    """Content-word stems used to guard embedding matches against lexical drift"""
+    # Crude 4-char prefix stems so inflections ("feel"/"feeling") still overlap
+    return frozenset(
+        token[:4] for token in _TOKEN_PATTERN.findall(text.lower())
+        if token not in _STOPWORDS
+    )
+
+
+# Domain terms that must agree for two queries to share an answer, however
+# close their embeddings are ("Socrates" vs "Aristotle" embed almost identically)
+_DOMAIN_TERMS = {
+    "socrates": "socrates", "socratic": "socrates",
+    "marcus": "marcus", "aurelius": "marcus", "stoic": "marcus", "stoics": "marcus", "stoicism": "marcus",
+    "lao": "laotzu", "tzu": "laotzu", "laozi": "laotzu", "dao": "laotzu", "tao": "laotzu",
+    "daoist": "laotzu", "taoist": "laotzu",
+    "aristotle": "aristotle", "aristotelian": "aristotle"
+}
+
+
+_AGENT_NAMES = frozenset(AGENT_NAMES)
+
+
+def cache_bucket(text: str, preferred_agents: Any = None) -> frozenset:
+    """Lexical shard key: philosophers named in the query plus explicitly preferred agents.
+
+    preferred_agents comes straight from the client, so only a list of known agent
+    names counts; anything else would let callers mint shards at will."""
+    terms = {_DOMAIN_TERMS[t] for t in _TOKEN_PATTERN.findall(text.lower()) if t in _DOMAIN_TERMS}
+    if isinstance(preferred_agents, (list, tuple)):
+        terms.update(a.lower() for a in preferred_agents if isinstance(a, str) and a.lower() in _AGENT_NAMES)
+    return frozenset(terms)
+
+
+def _jaccard(a: frozenset, b: frozenset) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class _Shard:
+    """Embeddings and values that share one lexical bucket"""
+
+    def __init__(self):
+        # Row i of the matrix is the L2-normalized embedding of entry i, so a
+        # matrix-vector product gives cosine similarity against every entry
+        self.embeddings: Optional[np.ndarray] = None
+        self.entries: List[Tuple[frozenset, Any]] = []
+
+
+class SemanticCache:
+    """Embedding-similarity cache so paraphrased queries reuse a stored result"""
+
+    def __init__(self, threshold: float = 0.92, min_overlap: float = 0.5, max_entries: int = 4096,
+                 ttl: int = SEMANTIC_CACHE_TTL):
+        self.threshold = threshold
+        self.min_overlap = min_overlap
+        # Bound on entries across all shards
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._shards: Dict[frozenset, _Shard] = {}
+        # (bucket, insertion time) of every stored entry, oldest first; each shard's
+        # entries are in insertion order too, so the oldest entry overall is its shard's first
+        self._order: deque = deque()
+        self.hits = 0
+        self.misses = 0
+
+    async def embed(self, text: str) -> Optional[np.ndarray]:
+        """Return a (1, dim) normalized embedding, or None when the model is unavailable"""
+        model = await _get_model()
+        if model is None:
+            return None
+        try:
+            return await asyncio.to_thread(model.encode, [text], normalize_embeddings=True)
+        except Exception as e:
+            logger.error("Semantic cache embedding failed: %s", e)
+            return None
+
+    def lookup(self, text: str, embedding: Optional[np.ndarray], bucket: frozenset = frozenset()) -> Optional[Any]:
+        """Return the cached value for a sufficiently similar query in the same bucket, if any"""
+        value = self._lookup(text, embedding, bucket)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def _lookup(self, text: str, embedding: Optional[np.ndarray], bucket: frozenset) -> Optional[Any]:
+        self._expire()
+        shard = self._shards.get(bucket)
+        if embedding is None or shard is None:
+            return None
+
+        scores = shard.embeddings @ embedding[0]
+        best = int(scores.argmax())
+        if scores[best] <= self.threshold:
+            return None
+
+        # Embeddings blur critical terms, so also require real lexical overlap
+        tokens, value = shard.entries[best]
+        if _jaccard(content_tokens(text), tokens) <= self.min_overlap:
+            return None
+        return value
+
+    def add(self, text: str, embedding: Optional[np.ndarray], value: Any, bucket: frozenset = frozenset()):
+        """Store a value under the query embedding, evicting the oldest entry overall when full"""
+        if embedding is None:
+            return
+
+        self._expire()
+        while len(self._order) >= self.max_entries:
+            self._evict_oldest()
+
+        shard = self._shards.setdefault(bucket, _Shard())
+        self._order.append((bucket, time.monotonic()))
+        shard.entries.append((content_tokens(text), value))
+        if shard.embeddings is None:
+            shard.embeddings = embedding
+        else:
+            shard.embeddings = np.vstack((shard.embeddings, embedding))
+
+    def _expire(self):
+        if self.ttl <= 0:
+            return
+        deadline = time.monotonic() - self.ttl
+        while self._order and self._order[0][1] <= deadline:
+            self._evict_oldest()
+
+    def _evict_oldest(self):
+        bucket, _ = self._order.popleft()
+        shard = self._shards[bucket]
+        shard.entries.pop(0)
+        if shard.entries:
+            shard.embeddings = shard.embeddings[1:]
+        else:
+            del self._shards[bucket]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._order),
+            "shards": len(self._shards)
+        }
@@ -0,0 +1,17 @@
+# tools/timestamps.py
+import time
+from datetime import datetime, timezone
+
+# (epoch milliseconds, formatted timestamp) of the last call
+_last = (-1, "")
+
+
+def utc_now_iso() -> str:
+    """Current UTC time as ISO-8601, formatted at most once per millisecond"""
+    global _last
+    ms = time.time_ns() // 1_000_000
+    if ms != _last[0]:
+        # Naive, like utcfromtimestamp (deprecated since 3.12), so no "+00:00" suffix
+        moment = datetime.fromtimestamp(ms / 1000, timezone.utc).replace(tzinfo=None)
+        _last = (ms, moment.isoformat(timespec="milliseconds"))
+    return _last[1]
@@ -1,37 +1,82 @@
 # wisdom_coordinator.py
-import json
 import asyncio
+import hashlib
 import logging
-from typing import Dict, Any, Optional, List, AsyncGenerator
-from datetime import datetime
-from ollama import Client
+import re
+from typing import Awaitable, Callable, Dict, Any, Iterable, Optional, List, AsyncGenerator, Mapping, Tuple
+from collections import ChainMap
+from contextvars import ContextVar
+from itertools import islice
+from cachetools import LRUCache
 import os
 
 from tools.llm_powered_agents import (
     PhilosophicalAgentFactory,
     MetacognitiveReflector,
-    DialogicalChallenger
+    DialogicalChallenger,
+    SHARED_PROMPT_PREFIX,
+    reasoning_budget,
+    token_sink
 )
+from tools.json_utils import extract_json, json_safe_str
+from tools.llm_cache import LLMCache, llm_response_cache
+from tools.ollama_shared import OLLAMA_MODEL, OLLAMA_SELECTOR_MODEL, chat_json
+from tools.response_schemas import (
+    AGENT_SELECTION_SCHEMA,
+    COGNITIVE_ANALYSIS_SCHEMA,
+    FUSED_ROUTING_SCHEMA,
+    SYNTHESIS_SCHEMA,
+    fused_reasoning_schema
+)
+from tools.semantic_cache import SemanticCache, cache_bucket
+from tools.timestamps import utc_now_iso
 
 logger = logging.getLogger(__name__)
 
-# Ollama configuration
-OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
-OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3")
-client = Client(host=OLLAMA_HOST)
+# Answer every independently-reasoning agent from one multi-persona LLM call
+FUSED_AGENT_CALLS = os.getenv("PRISMAI_FUSED_AGENTS", "0") == "1"
+# Produce the cognitive analysis and the agent selection from one LLM call
+FUSED_ROUTING = os.getenv("PRISMAI_FUSED_ROUTING", "0") == "1"
+# Start agent selection on a heuristic draft of the cognitive analysis instead of
+# waiting for the real one; it is redone only if the two disagree by more than this.
+# Opt-in: every disagreement costs an extra selector call and Ollama slot
+SPECULATIVE_SELECTION = os.getenv("PRISMAI_SPECULATIVE_SELECTION", "0") == "1"
+SPECULATION_TOLERANCE = 0.2
 
-class System15Controller:
-    """Implements the revolutionary System 1.5 metacognitive framework"""
-    
-    def __init__(self):
-        self.cognitive_load_threshold = 0.7
-        self.complexity_levels = ["simple", "moderate", "complex", "advanced"]
-    
-    async def analyze_cognitive_load(self, query: str) -> Dict[str, Any]:
-        """Assess cognitive complexity and user readiness"""
-        analysis_prompt = f"""
-Analyze the cognitive load and complexity of this query:
-"{query}"
+# Independent reasoning steps are reused across paraphrased queries, per philosopher and
+# per exact agent context. The context carries the routing answers, so hits mostly come
+# from repeated questions; opt-in, since each lookup costs an embedding
+REASONING_STEP_CACHE = os.getenv("PRISMAI_REASONING_STEP_CACHE", "0") == "1"
+reasoning_step_cache = SemanticCache()
+
+# When set, collaboration patterns report each (position, step) here as soon as that
+# step is final, so it can be streamed or consumed before the whole chain is done
+step_sink: ContextVar[Optional[Callable[[int, Dict], None]]] = ContextVar("step_sink", default=None)
+
+def _emit_step(index: int, reasoning_step: Dict):
+    sink = step_sink.get()
+    if sink is not None:
+        sink(index, reasoning_step)
+
+# Greetings are answered by the rule-based council, no LLM calls. Short questions can be
+# real ones ("Should I quit?"), so routing them there too is opt-in via a word limit
+TRIVIAL_FAST_PATH = os.getenv("PRISMAI_TRIVIAL_FAST_PATH", "1") == "1"
+TRIVIAL_QUERY_MAX_WORDS = int(os.getenv("PRISMAI_TRIVIAL_QUERY_MAX_WORDS", "0"))
+GREETINGS = frozenset({
+    "hi", "hello", "hey", "greetings", "thanks", "thank you",
+    "good morning", "good afternoon", "good evening"
+})
+RULE_BASED_PHILOSOPHERS = {
+    "socrates": "Socrates",
+    "marcus": "Marcus Aurelius",
+    "laotzu": "Lao Tzu",
+    "aristotle": "Aristotle"
+}
+
+# Static halves of the analysis and selection prompts, sent as system messages ahead
+# of the per-query details so they are built once and prefilled once by Ollama
+COGNITIVE_ANALYSIS_INSTRUCTIONS = """
+You analyze the cognitive load and complexity of a person's query.
 
 Rate on scales of 0.0-1.0:
 - emotional_intensity: How emotionally charged is this?
@@ -41,7 +86,7 @@ Rate on scales of 0.0-1.0:
 - personal_stakes: How significant is this to the person's life?
 
 Return JSON:
-{{
+{
     "overall_load": 0.0-1.0,
     "emotional_intensity": 0.0-1.0,
     "conceptual_complexity": 0.0-1.0,
@@ -51,19 +96,302 @@ Return JSON:
     "recommended_approach": "gentle|standard|intensive",
     "suggested_agents": ["agent1", "agent2"],
     "pacing_recommendation": "slow|normal|rapid"
-}}
+}
+"""
+
+AGENT_SELECTION_INSTRUCTIONS = """
+You are an expert AI coordinator selecting philosophical agents for optimal wisdom generation.
+
+AGENT CAPABILITIES:
+- SOCRATES: Assumption examination, definitional clarity, epistemic inquiry, revealing contradictions
+- MARCUS AURELIUS: Anxiety management, control dichotomy, control resilience building, practical action
+- LAO TZU: Flow states, natural solutions, balance, reducing resistance and force
+- ARISTOTLE: Systematic analysis, habit formation, virtue development, golden mean
+
+SELECTION CRITERIA:
+1. Emotional tone → Agent fit (anxiety→Marcus, confusion→Socrates, forcing→Lao Tzu, analysis→Aristotle)
+2. Problem complexity → Number of agents (simple=2, complex=3-4)
+3. User readiness → Depth level (gentle/standard/intensive)
+4. Complementary perspectives → Avoid redundancy, ensure diverse viewpoints
+
+Return JSON:
+{
+    "selected_agents": ["agent1", "agent2", "agent3"],
+    "primary_agent": "most_relevant_agent",
+    "collaboration_pattern": "sequential|parallel|hierarchical|dialectical",
+    "reasoning_depth": "surface|moderate|deep|profound",
+    "selection_rationale": "detailed explanation of choices",
+    "expected_synergies": ["how agents complement each other"]
+}
+Make sure "selected_agents" is a list of strings only, using lowercase names like "socrates", "marcus", "laotzu", "aristotle".
+"""
+
+FUSED_ROUTING_INSTRUCTIONS = (
+    "\nYou prepare a person's query for a council of philosophers in two parts, both in one answer.\n"
+    "\nPART 1 - COGNITIVE ANALYSIS" + COGNITIVE_ANALYSIS_INSTRUCTIONS
+    + "\nPART 2 - AGENT SELECTION, informed by your analysis" + AGENT_SELECTION_INSTRUCTIONS
+    + '\nReturn ONE JSON object holding both parts: {"cognitive_analysis": {...}, "agent_selection": {...}}\n'
+)
+
+# LLM cognitive analyses and agent selections per normalized query. Both are small and
+# near-deterministic, so they are kept far longer than generated text
+SELECTOR_CACHE_SIZE = int(os.getenv("PRISMAI_SELECTOR_CACHE_SIZE", "50000"))
+SELECTOR_CACHE_TTL = int(os.getenv("PRISMAI_SELECTOR_CACHE_TTL", str(24 * 3600)))
+analysis_cache = LLMCache(maxsize=SELECTOR_CACHE_SIZE, ttl=SELECTOR_CACHE_TTL)
+selector_cache = LLMCache(maxsize=SELECTOR_CACHE_SIZE, ttl=SELECTOR_CACHE_TTL)
+
+# Cues for the draft cognitive analysis that speculative selection starts from
+_EMOTION_PATTERN = re.compile(
+    r"\b(?:anxi\w*|afraid|fear\w*|worr\w*|overwhelm\w*|stress\w*|panic\w*|lost|angry|anger|sad\w*|"
+    r"grie\w*|hurt\w*|lonely|depress\w*|scared|desperate|hopeless)\b"
+)
+_URGENCY_PATTERN = re.compile(r"\b(?:now|today|tomorrow|urgent\w*|deadline|immediately|soon)\b")
+
+_PUNCTUATION_PATTERN = re.compile(r"[^\w\s']+")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+def normalize_query(query: str) -> str:
+    """Case, punctuation and spacing insensitive form of a query, for routing cache keys"""
+    return _WHITESPACE_PATTERN.sub(" ", _PUNCTUATION_PATTERN.sub(" ", query.lower())).strip()
+
+def _routing_key(*parts: Any) -> str:
+    return hashlib.sha256("|".join(map(str, parts)).encode()).hexdigest()
+
+# Complete results per normalized query and context, so an exact repeat skips every LLM call
+RESULT_CACHE_SIZE = int(os.getenv("PRISMAI_RESULT_CACHE_SIZE", "512"))
+RESULT_CACHE_TTL = int(os.getenv("PRISMAI_RESULT_CACHE_TTL", "3600"))
+
+FALLBACK_INTEGRATED_WISDOM = "Multiple philosophical perspectives offer complementary wisdom for addressing your concern."
+
+def is_cacheable_result(final_result: Mapping[str, Any]) -> bool:
+    """Whether a result may be replayed: a canned synthesis means the model was unreachable"""
+    synthesis = final_result.get("synthesis") or {}
+    return ("error" not in final_result
+            and synthesis.get("integrated_wisdom") not in (None, FALLBACK_INTEGRATED_WISDOM))
+
+def context_digest(context: Optional[Mapping]) -> str:
+    """Stable hash of a context mapping, independent of key order at every level"""
+    return _routing_key("context", json_safe_str(context or {}, sort_keys=True))
+
+def _result_key(query: str, context: Optional[Mapping]) -> str:
+    # Context reaches the agent prompts, so it is part of the key
+    return _routing_key("result", normalize_query(query), context_digest(context))
+
+def _load_bucket(cognitive_analysis: Dict) -> Optional[float]:
+    # Selection depends on the analysis, but only coarsely; 0.1 steps keep hits likely
+    try:
+        return round(float(cognitive_analysis.get("overall_load")), 1)
+    except (TypeError, ValueError):
+        return None
+
+# Synthesis runs as a rolling per-session conversation so Ollama can reuse the KV
+# cache of earlier turns. A history past the size limit is dropped and restarted
+# rather than trimmed, since trimming would change the prefix anyway; keep the
+# limit well inside the model's context window (num_ctx)
+SESSION_HISTORY_SESSIONS = int(os.getenv("PRISMAI_SESSION_HISTORY_SESSIONS", "1024"))
+SYNTHESIS_HISTORY_MAX_CHARS = int(os.getenv("PRISMAI_SYNTHESIS_HISTORY_MAX_CHARS", "12000"))
+
+# Reasoning chain size in the synthesis prompt (about 4 characters per token), so a
+# long dialectical run doesn't push synthesis prefill past ~1500 tokens
+SYNTHESIS_CHAIN_MAX_CHARS = int(os.getenv("PRISMAI_SYNTHESIS_CHAIN_MAX_CHARS", "6000"))
+SYNTHESIS_FIELD_MAX_CHARS = 400
+
+SYNTHESIS_INSTRUCTIONS = """
+You are a master synthesizer creating transformative wisdom from multiple philosophical perspectives.
+
+For each query you receive, with its reasoning chain, agent selection rationale and cognitive analysis,
+create a comprehensive synthesis as JSON:
+{
+    "integrated_wisdom": "unified insight combining all perspectives",
+    "key_insights": ["most important discoveries"],
+    "practical_steps": ["specific actionable guidance"],
+    "metacognitive_enhancement": "how this process improves thinking skills",
+    "reasoning_quality_assessment": "evaluation of the reasoning process",
+    "cognitive_bridges": ["connections between different thinking modes"],
+    "transformative_elements": ["aspects that could change user's perspective"],
+    "application_scenarios": ["where this wisdom applies"],
+    "deepening_questions": ["questions for continued exploration"]
+}
+"""
+
+# Queries whose keyword cues name two or more agents skip the LLM selection call
+KEYWORD_ROUTING = os.getenv("PRISMAI_KEYWORD_ROUTING", "1") == "1"
+
+# Keyword cues for the fallback agent selection, in the order agents are added
+HEURISTIC_KEYWORDS = {
+    "socrates": ["confused", "unclear", "don't understand", "what is"],
+    "laotzu": ["stuck", "forcing", "struggle", "balance"],
+    "aristotle": ["decision", "analyze", "plan", "habit"]
+}
+# One alternation over every cue; the named group that matched identifies the agent
+HEURISTIC_KEYWORD_PATTERN = re.compile("|".join(
+    f"(?P<{agent}>{'|'.join(map(re.escape, words))})" for agent, words in HEURISTIC_KEYWORDS.items()
+))
+
+# Reasoning step fields later prompts need; the rest (metacognitive notes, peer
+# validation details, timestamps) only matters to the client
+PROMPT_STEP_FIELDS = ("philosopher", "reasoning_type", "core_insight", "practical_application",
+                      "socratic_catalyst", "dialectical_synthesis")
+
+def _prompt_projection(step: Dict) -> Dict:
+    return {field: step[field] for field in PROMPT_STEP_FIELDS if step.get(field)}
+
+def _clip(value: Any, limit: int) -> Any:
+    if isinstance(value, str) and len(value) > limit:
+        return value[:max(0, limit - 3)].rstrip() + "..."
+    return value
+
+def is_trivial_query(query: str) -> bool:
+    normalized = query.strip().lower().rstrip("!?.")
+    return normalized in GREETINGS or len(normalized.split()) <= TRIVIAL_QUERY_MAX_WORDS
+
+async def _gather_or_cancel(aws: Iterable[Awaitable], fallback: Callable[[int], Any]) -> List[Any]:
+    """Runs the awaitables concurrently and cancels the rest as soon as one fails, the
+    way a TaskGroup would (the service still supports Python 3.10), so an agent that
+    timed out or lost Ollama doesn't leave its peers holding slots for a round that
+    is already degraded. Every awaitable that failed or was cancelled gets fallback(i)."""
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    if not tasks:
+        return []
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    
+    results = []
+    for i, task in enumerate(tasks):
+        if task.cancelled():
+            results.append(fallback(i))
+        elif task.exception() is not None:
+            logger.error("Agent call failed, cancelling its peers: %r", task.exception())
+            results.append(fallback(i))
+        else:
+            results.append(task.result())
+    return results
+
+async def _cached_chat(messages: List[Dict], temperature: float, max_tokens: int,
+                       model: str = OLLAMA_MODEL, source: str = "Coordinator",
+                       schema: Optional[Dict[str, Any]] = None) -> str:
+    """Chat completion, replayed from the response cache for low-temperature prompts.
+    
+    Deltas are reported to token_sink, when set, under the given source name."""
+    key = None
+    if llm_response_cache.cacheable(temperature):
+        key = llm_response_cache.key(model, messages, temperature, max_tokens, schema)
+        cached = await llm_response_cache.get(key)
+        if cached is not None:
+            return cached
+    
+    sink = token_sink.get()
+    on_delta = None if sink is None else lambda delta: sink(source, delta)
+    options = {"temperature": temperature, "num_predict": max_tokens}
+    content = await chat_json(model, messages, options, on_delta, schema)
+    if key is not None and content:
+        await llm_response_cache.set(key, content)
+    return content
+
+class System15Controller:
+    """Implements the revolutionary System 1.5 metacognitive framework"""
+    
+    __slots__ = ("cognitive_load_threshold", "complexity_levels")
+    
+    def __init__(self):
+        self.cognitive_load_threshold = 0.7
+        self.complexity_levels = ["simple", "moderate", "complex", "advanced"]
+    
+    def draft_cognitive_load(self, query: str) -> Dict[str, Any]:
+        """Instant keyword estimate of the cognitive analysis, for speculative agent selection"""
+        q_lower = query.lower()
+        emotional_intensity = min(1.0, 0.3 + 0.2 * len(_EMOTION_PATTERN.findall(q_lower)))
+        decision_urgency = min(1.0, 0.3 + 0.2 * len(_URGENCY_PATTERN.findall(q_lower)))
+        conceptual_complexity = min(1.0, 0.3 + len(q_lower.split()) / 60)
+        return {
+            "overall_load": round((emotional_intensity + decision_urgency + conceptual_complexity) / 3, 2),
+            "emotional_intensity": emotional_intensity,
+            "conceptual_complexity": round(conceptual_complexity, 2),
+            "decision_urgency": decision_urgency,
+            "ambiguity_level": 0.4,
+            "personal_stakes": 0.6,
+            "recommended_approach": "standard",
+            "suggested_agents": ["socrates", "marcus"],
+            "pacing_recommendation": "normal"
+        }
+    
+    @staticmethod
+    def draft_agrees(draft: Dict[str, Any], analysis: Dict[str, Any]) -> bool:
+        """Whether a selection made from the draft still fits the real analysis"""
+        for field in ("overall_load", "emotional_intensity"):
+            try:
+                if abs(float(analysis.get(field)) - draft[field]) > SPECULATION_TOLERANCE:
+                    return False
+            except (TypeError, ValueError):
+                return False
+        return True
+    
+    async def analyze_and_select(self, query: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """Cognitive analysis and agent selection from a single LLM call.
+        
+        Returns None when the separate calls should be used instead: the analysis is
+        already cached, or the answer is missing either part.
+        """
+        normalized = normalize_query(query)
+        analysis_key = _routing_key("cogload", normalized)
+        if await analysis_cache.get(analysis_key) is not None:
+            return None
+        
+        try:
+            messages = [
+                {"role": "system", "content": FUSED_ROUTING_INSTRUCTIONS},
+                {"role": "user", "content": f'\nQUERY: "{query}"\n'}
+            ]
+            response = await self._call_ollama(messages, temperature=0.3, max_tokens=1200,
+                                               schema=FUSED_ROUTING_SCHEMA)
+        except Exception as e:
+            logger.error("Fused routing failed: %s", e)
+            return None
+        
+        routing = extract_json(response) or {}
+        analysis = routing.get("cognitive_analysis")
+        selection = routing.get("agent_selection")
+        if not (isinstance(analysis, dict) and isinstance(selection, dict)
+                and isinstance(selection.get("selected_agents"), list) and selection["selected_agents"]):
+            logger.info("Fused routing answer incomplete, using separate analysis and selection")
+            return None
+        
+        await analysis_cache.set(analysis_key, dict(analysis))
+        await selector_cache.set(_routing_key("agentsel", normalized, _load_bucket(analysis)), dict(selection))
+        return analysis, selection
+    
+    async def analyze_cognitive_load(self, query: str) -> Dict[str, Any]:
+        """Assess cognitive complexity and user readiness"""
+        analysis_key = _routing_key("cogload", normalize_query(query))
+        cached = await analysis_cache.get(analysis_key)
+        if cached is not None:
+            return dict(cached)
+        
+        analysis_prompt = f"""
+Analyze the cognitive load and complexity of this query:
+"{query}"
 """
         
         try:
-            messages = [{"role": "user", "content": analysis_prompt}]
-            response = await self._call_ollama(messages, temperature=0.3)
+            messages = [
+                {"role": "system", "content": COGNITIVE_ANALYSIS_INSTRUCTIONS},
+                {"role": "user", "content": analysis_prompt}
+            ]
+            response = await self._call_ollama(messages, temperature=0.3, schema=COGNITIVE_ANALYSIS_SCHEMA)
             
-            json_start = response.find('{')
-            json_end = response.rfind('}') + 1
-            if json_start >= 0 and json_end > json_start:
-                return json.loads(response[json_start:json_end])
-        except:
-            pass
+            analysis = extract_json(response)
+            if analysis is not None:
+                await analysis_cache.set(analysis_key, dict(analysis))
+                return analysis
+        except Exception as e:
+            logger.error("Cognitive load analysis failed: %s", e)
         
         # Fallback analysis
         return {
@@ -78,20 +406,16 @@ Return JSON:
             "pacing_recommendation": "normal"
         }
     
-    async def _call_ollama(self, messages: List[Dict], temperature: float = 0.7) -> str:
-        """Async Ollama API wrapper"""
-        def sync_call():
-            options = {"temperature": temperature, "num_predict": 800}
-            resp = client.chat(model=OLLAMA_MODEL, messages=messages, options=options)
-            if isinstance(resp, dict):
-                return resp.get("message", {}).get("content", "")
-            return getattr(resp.message, "content", "")
-        
-        return await asyncio.to_thread(sync_call)
+    async def _call_ollama(self, messages: List[Dict], temperature: float = 0.7, max_tokens: int = 800,
+                           schema: Optional[Dict[str, Any]] = None) -> str:
+        """Async Ollama API wrapper; the analysis is a routing call, so it uses the selector model"""
+        return await _cached_chat(messages, temperature, max_tokens, OLLAMA_SELECTOR_MODEL, schema=schema)
 
 class AdvancedAgentOrchestrator:
     """Intelligent orchestration of multiple philosophical agents"""
     
+    __slots__ = ("agent_factory", "collaboration_patterns")
+    
     def __init__(self):
         self.agent_factory = PhilosophicalAgentFactory()
         self.collaboration_patterns = {
@@ -103,70 +427,59 @@ class AdvancedAgentOrchestrator:
     
     async def select_optimal_agents(self, query: str, cognitive_analysis: Dict) -> Dict[str, Any]:
         """AI-powered intelligent agent selection"""
+        # Clear keyword cues for two or more agents settle the choice without an LLM call
+        keyword_agents = self._keyword_agents(query)
+        if KEYWORD_ROUTING and len(keyword_agents) >= 2:
+            selection = self._heuristic_agent_selection(query, cognitive_analysis, keyword_agents)
+            selection["selection_rationale"] = "Keyword routing: the query clearly calls for " + ", ".join(keyword_agents)
+            return selection
+        
+        selector_key = _routing_key("agentsel", normalize_query(query), _load_bucket(cognitive_analysis))
+        cached = await selector_cache.get(selector_key)
+        if cached is not None:
+            return dict(cached)
+        
         selection_prompt = f"""
-You are an expert AI coordinator selecting philosophical agents for optimal wisdom generation.
-
 QUERY: "{query}"
-COGNITIVE_ANALYSIS: {json.dumps(cognitive_analysis, indent=2)}
-
-AGENT CAPABILITIES:
-- SOCRATES: Assumption examination, definitional clarity, epistemic inquiry, revealing contradictions
-- MARCUS AURELIUS: Anxiety management, control dichotomy, control resilience building, practical action
-- LAO TZU: Flow states, natural solutions, balance, reducing resistance and force
-- ARISTOTLE: Systematic analysis, habit formation, virtue development, golden mean
-
-SELECTION CRITERIA:
-1. Emotional tone → Agent fit (anxiety→Marcus, confusion→Socrates, forcing→Lao Tzu, analysis→Aristotle)
-2. Problem complexity → Number of agents (simple=2, complex=3-4)
-3. User readiness → Depth level (gentle/standard/intensive)
-4. Complementary perspectives → Avoid redundancy, ensure diverse viewpoints
-
-Return JSON:
-{{
-    "selected_agents": ["agent1", "agent2", "agent3"],
-    "primary_agent": "most_relevant_agent",
-    "collaboration_pattern": "sequential|parallel|hierarchical|dialectical",
-    "reasoning_depth": "surface|moderate|deep|profound",
-    "selection_rationale": "detailed explanation of choices",
-    "expected_synergies": ["how agents complement each other"]
-}}
-Make sure "selected_agents" is a list of strings only, using lowercase names like "socrates", "marcus", "laotzu", "aristotle".
+COGNITIVE_ANALYSIS: {json_safe_str(cognitive_analysis)}
 """
         
         try:
-            messages = [{"role": "user", "content": selection_prompt}]
-            response = await self._call_ollama(messages, temperature=0.4)
+            messages = [
+                {"role": "system", "content": AGENT_SELECTION_INSTRUCTIONS},
+                {"role": "user", "content": selection_prompt}
+            ]
+            response = await self._call_ollama(messages, temperature=0.4, model=OLLAMA_SELECTOR_MODEL,
+                                               schema=AGENT_SELECTION_SCHEMA)
             
-            json_start = response.find('{')
-            json_end = response.rfind('}') + 1
-            if json_start >= 0 and json_end > json_start:
-                return json.loads(response[json_start:json_end])
+            selection = extract_json(response)
+            if selection is not None:
+                await selector_cache.set(selector_key, dict(selection))
+                return selection
         except Exception as e:
-            logger.error(f"Agent selection failed: {e}")
+            logger.error("Agent selection failed: %s", e)
         
         # Fallback selection using heuristics
-        return self._heuristic_agent_selection(query, cognitive_analysis)
+        return self._heuristic_agent_selection(query, cognitive_analysis, keyword_agents)
     
-    def _heuristic_agent_selection(self, query: str, cognitive_analysis: Dict) -> Dict[str, Any]:
+    @staticmethod
+    def _keyword_agents(query: str) -> List[str]:
+        """Agents whose keyword cues appear in the query, in HEURISTIC_KEYWORDS order"""
+        # Confusion/clarity needs, flow/resistance issues, analysis/decision needs,
+        # all found in one scan of the query
+        matched = {match.lastgroup for match in HEURISTIC_KEYWORD_PATTERN.finditer(query.lower())}
+        return [agent for agent in HEURISTIC_KEYWORDS if agent in matched]
+    
+    def _heuristic_agent_selection(self, query: str, cognitive_analysis: Dict,
+                                   keyword_agents: Optional[List[str]] = None) -> Dict[str, Any]:
         """Fallback heuristic-based agent selection"""
         selected = []
-        q_lower = query.lower()
         
         # Emotional state mapping
         if cognitive_analysis.get("emotional_intensity", 0) > 0.6:
             selected.append("marcus")
         
-        # Confusion/clarity needs
-        if any(word in q_lower for word in ["confused", "unclear", "don't understand", "what is"]):
-            selected.append("socrates")
-        
-        # Flow/resistance issues
-        if any(word in q_lower for word in ["stuck", "forcing", "struggle", "balance"]):
-            selected.append("laotzu")
-        
-        # Analysis/decision needs
-        if any(word in q_lower for word in ["decision", "analyze", "plan", "habit"]):
-            selected.append("aristotle")
+        selected.extend(keyword_agents if keyword_agents is not None else self._keyword_agents(query))
         
         # Ensure minimum 2 agents
         if len(selected) < 2:
@@ -181,102 +494,239 @@ Make sure "selected_agents" is a list of strings only, using lowercase names lik
             "expected_synergies": ["Diverse philosophical perspectives"]
         }
     
-    async def _call_ollama(self, messages: List[Dict], temperature: float = 0.7) -> str:
+    async def _call_ollama(self, messages: List[Dict], temperature: float = 0.7, max_tokens: int = 1000,
+                           model: str = OLLAMA_MODEL, schema: Optional[Dict[str, Any]] = None) -> str:
         """Async Ollama API wrapper"""
-        def sync_call():
-            options = {"temperature": temperature, "num_predict": 1000}
-            resp = client.chat(model=OLLAMA_MODEL, messages=messages, options=options)
-            if isinstance(resp, dict):
-                return resp.get("message", {}).get("content", "")
-            return getattr(resp.message, "content", "")
-        
-        return await asyncio.to_thread(sync_call)
+        return await _cached_chat(messages, temperature, max_tokens, model, source="Council", schema=schema)
     
-    async def _sequential_reasoning(self, agents: List, query: str, context: Dict) -> List[Dict]:
+    async def _sequential_reasoning(self, agents: List, query: str, context: Mapping) -> List[Dict]:
         """Sequential reasoning where each agent builds on previous insights"""
         reasoning_chain = []
-        accumulated_context = context.copy()
+        # Overlays instead of copies: the shared context is never duplicated per agent
+        accumulated_context = ChainMap({}, context)
         
         for i, agent in enumerate(agents):
-            step_context = {
-                **accumulated_context,
-                "previous_insights": reasoning_chain,
+            step_context = ChainMap({
+                "previous_insights": [_prompt_projection(step) for step in reasoning_chain],
                 "position_in_sequence": i + 1,
                 "total_agents": len(agents)
-            }
+            }, accumulated_context)
             
             reasoning_step = await agent.generate_reasoning_step(query, step_context)
             reasoning_chain.append(reasoning_step)
+            _emit_step(i, reasoning_step)
             
             # Add this insight to context for next agent
             accumulated_context[f"insight_from_{agent.philosopher_name}"] = reasoning_step.get("core_insight", "")
         
         return reasoning_chain
     
-    async def _parallel_reasoning(self, agents: List, query: str, context: Dict) -> List[Dict]:
-        """Parallel reasoning where agents work independently"""
-        tasks = []
+    async def _parallel_reasoning(self, agents: List, query: str, context: Mapping,
+                                  embedding: Optional[Any] = None) -> List[Dict]:
+        """Parallel reasoning where agents work independently
+        
+        embedding is the query's semantic cache embedding, when the caller already has one."""
+        names = [agent.philosopher_name for agent in agents]
+        
+        # A step depends on the query, the philosopher and the context its prompt carries
+        # (user context, routing, collaboration mode and round), so a paraphrase of an
+        # earlier query reuses it only under the same persona and the same context
+        if not REASONING_STEP_CACHE:
+            embedding = None
+        elif embedding is None:
+            embedding = await reasoning_step_cache.embed(query)
+        base_bucket = cache_bucket(query)
+        buckets = [
+            base_bucket | {name.lower(), context_digest(self._independent_context(context, agent, names))}
+            for name, agent in zip(names, agents)
+        ] if REASONING_STEP_CACHE else [base_bucket] * len(agents)
+        reasoning_chain = []
+        for i, bucket in enumerate(buckets):
+            cached = reasoning_step_cache.lookup(query, embedding, bucket)
+            if cached is not None:
+                cached = dict(cached)
+                _emit_step(i, cached)
+            reasoning_chain.append(cached)
+        
+        async def reason(i: int) -> Tuple[Dict, bool]:
+            result = await agents[i]._generate_reasoning_step(
+                query, self._independent_context(context, agents[i], names)
+            )
+            _emit_step(i, result[0])
+            return result
+        
+        pending = [i for i, step in enumerate(reasoning_chain) if step is None]
+        if FUSED_AGENT_CALLS and len(pending) > 1:
+            fresh = await self._fused_reasoning([agents[i] for i in pending], query, context, names)
+            for i, (reasoning_step, _) in zip(pending, fresh):
+                _emit_step(i, reasoning_step)
+        else:
+            fresh = await _gather_or_cancel(
+                (reason(i) for i in pending),
+                lambda n: (agents[pending[n]].fallback_reasoning_step(), False)
+            )
+        
+        for i, (reasoning_step, from_model) in zip(pending, fresh):
+            if from_model:
+                reasoning_step_cache.add(query, embedding, dict(reasoning_step), buckets[i])
+            reasoning_chain[i] = reasoning_step
+        
+        return reasoning_chain
+    
+    @staticmethod
+    def _independent_context(context: Mapping, agent, names: List[str]) -> Mapping:
+        return ChainMap({
+            "collaboration_mode": "independent",
+            "other_agents": [name for name in names if name != agent.philosopher_name]
+        }, context)
+    
+    @staticmethod
+    def _fused_key(name: Any) -> str:
+        # The model tends to drift on key spelling ("Lao Tzu", "lao_tzu", "LaoTzu")
+        return "".join(ch for ch in str(name).lower() if ch.isalnum())
+    
+    async def _fused_reasoning(self, agents: List, query: str, context: Mapping,
+                               names: List[str]) -> List[Tuple[Dict, bool]]:
+        """Independent reasoning for several agents from a single multi-persona LLM call.
+        
+        Returns (step, from_model) pairs in agent order, like the per-agent calls."""
+        fused_names = [agent.philosopher_name for agent in agents]
+        personas = "\n\n".join(f"=== {agent.philosopher_name} ===\n{agent.persona_prompt}" for agent in agents)
+        # Fixed for a given set of philosophers, so it goes in the system message and
+        # Ollama reuses its prefill whenever the same council is fused again
+        fused_system_prompt = f"""{SHARED_PROMPT_PREFIX}You are voicing a council of philosophers. Answer as EACH of them independently, staying true to their own method and style.
+
+{personas}
+
+Return strictly JSON with exactly one key per philosopher ({", ".join(fused_names)}), each holding that philosopher's reasoning step:
+{{
+    "<philosopher name>": {{
+        "philosopher": "<philosopher name>",
+        "reasoning_type": "analytical|intuitive|bridging",
+        "core_insight": "main philosophical insight",
+        "reasoning_process": "step-by-step thought process",
+        "metacognitive_awareness": "reflection on own thinking",
+        "socratic_catalyst": "thought-provoking question for user",
+        "practical_application": "how to apply this wisdom",
+        "connection_to_principles": "link to core philosophical principles",
+        "cognitive_stimulation": "element designed to enhance user thinking"
+    }}
+}}
+"""
+        fused_prompt = f"""User Query: {query}
+Context: {json_safe_str(ChainMap({"collaboration_mode": "independent"}, context))}
+"""
+        
+        steps = {}
+        try:
+            messages = [
+                {"role": "system", "content": fused_system_prompt},
+                {"role": "user", "content": fused_prompt}
+            ]
+            # Each persona gets the budget its own call would have had
+            response = await self._call_ollama(messages, temperature=0.8,
+                                               max_tokens=reasoning_budget(query) * len(agents),
+                                               schema=fused_reasoning_schema(fused_names))
+            
+            parsed = extract_json(response)
+            if parsed is not None:
+                steps = {self._fused_key(key): step for key, step in parsed.items()}
+        except Exception as e:
+            logger.error("Fused agent reasoning failed: %s", e)
+        
+        # Any philosopher the fused answer missed gets its own call, as in the unfused path
+        results = []
+        missing = []
         for agent in agents:
-            agent_context = {
-                **context,
-                "collaboration_mode": "independent",
-                "other_agents": [a.philosopher_name for a in agents if a != agent]
-            }
-            tasks.append(agent.generate_reasoning_step(query, agent_context))
+            step = steps.get(self._fused_key(agent.philosopher_name))
+            if isinstance(step, dict):
+                step["philosopher"] = agent.philosopher_name
+                results.append((step, True))
+            else:
+                results.append(None)
+                missing.append(agent)
+        
+        if missing:
+            logger.info("Fused reasoning missed %d of %d philosophers, calling them directly", len(missing), len(agents))
+            fallback_steps = iter(await _gather_or_cancel(
+                (agent._generate_reasoning_step(query, self._independent_context(context, agent, names))
+                 for agent in missing),
+                lambda n: (missing[n].fallback_reasoning_step(), False)
+            ))
+            results = [result if result is not None else next(fallback_steps) for result in results]
         
-        return await asyncio.gather(*tasks)
+        return results
     
-    async def _hierarchical_reasoning(self, agents: List, query: str, context: Dict) -> List[Dict]:
+    async def _hierarchical_reasoning(self, agents: List, query: str, context: Mapping) -> List[Dict]:
         """Hierarchical reasoning with primary agent leading"""
         primary_agent = agents[0]
         secondary_agents = agents[1:]
         
         # Primary agent provides foundational reasoning
-        primary_reasoning = await primary_agent.generate_reasoning_step(query, {
-            **context,
+        primary_reasoning = await primary_agent.generate_reasoning_step(query, ChainMap({
             "role": "primary_reasoner",
             "responsibility": "provide_foundation"
-        })
+        }, context))
+        _emit_step(0, primary_reasoning)
         
-        # Secondary agents elaborate and refine
-        secondary_tasks = []
-        for agent in secondary_agents:
-            agent_context = {
-                **context,
-                "primary_reasoning": primary_reasoning,
+        async def elaborate(i: int, agent) -> Dict:
+            reasoning_step, _ = await agent._generate_reasoning_step(query, ChainMap({
+                "primary_reasoning": _prompt_projection(primary_reasoning),
                 "role": "secondary_elaborator"
-            }
-            secondary_tasks.append(agent.generate_reasoning_step(query, agent_context))
+            }, context))
+            _emit_step(i, reasoning_step)
+            return reasoning_step
         
-        secondary_reasoning = await asyncio.gather(*secondary_tasks)
+        # Secondary agents elaborate and refine
+        secondary_tasks = [elaborate(i, agent) for i, agent in enumerate(secondary_agents, start=1)]
+        
+        secondary_reasoning = await _gather_or_cancel(
+            secondary_tasks, lambda n: secondary_agents[n].fallback_reasoning_step()
+        )
         
         return [primary_reasoning] + secondary_reasoning
     
-    async def _dialectical_reasoning(self, agents: List, query: str, context: Dict) -> List[Dict]:
+    async def _dialectical_reasoning(self, agents: List, query: str, context: Mapping,
+                                     embedding: Optional[Any] = None) -> List[Dict]:
         """Dialectical reasoning with agents challenging each other"""
         if len(agents) < 2:
-            return await self._parallel_reasoning(agents, query, context)
+            return await self._parallel_reasoning(agents, query, context, embedding)
         
-        # First round: initial positions
-        initial_reasoning = await self._parallel_reasoning(agents, query, {
-            **context,
-            "dialectical_round": 1,
-            "instruction": "present_your_perspective"
-        })
+        # Each agent validates the first of its peers' positions (agent 0 validates agent 1),
+        # so its second round starts as soon as that one position lands rather than after all
+        loop = asyncio.get_running_loop()
+        initial_positions = [loop.create_future() for _ in agents]
         
-        # Second round: cross-validation and synthesis
-        validation_tasks = []
-        for i, agent in enumerate(agents):
-            other_reasoning = [r for j, r in enumerate(initial_reasoning) if j != i]
-            validation_context = {
-                **context,
-                "dialectical_round": 2,
-                "peer_reasoning": other_reasoning,
-                "instruction": "validate_and_synthesize"
-            }
-            validation_tasks.append(agent.validate_peer_reasoning(other_reasoning[0] if other_reasoning else {}))
+        def position_ready(i: int, reasoning_step: Dict):
+            if not initial_positions[i].done():
+                initial_positions[i].set_result(reasoning_step)
         
-        validations = await asyncio.gather(*validation_tasks)
+        async def validate(i: int, agent) -> Dict:
+            peer_reasoning = await initial_positions[1 if i == 0 else 0]
+            return await agent.validate_peer_reasoning(peer_reasoning)
+        
+        # Second round: cross-validation and synthesis, waiting on first-round positions.
+        # Only the combined steps are final, so the first round is not reported upstream
+        sink_token = step_sink.set(position_ready)
+        try:
+            validation_tasks = [asyncio.create_task(validate(i, agent)) for i, agent in enumerate(agents)]
+            
+            # First round: initial positions
+            try:
+                initial_reasoning = await self._parallel_reasoning(agents, query, ChainMap({
+                    "dialectical_round": 1,
+                    "instruction": "present_your_perspective"
+                }, context), embedding)
+            except BaseException:
+                for task in validation_tasks:
+                    task.cancel()
+                raise
+        finally:
+            step_sink.reset(sink_token)
+        
+        for i, reasoning in enumerate(initial_reasoning):
+            position_ready(i, reasoning)
+        validations = await _gather_or_cancel(validation_tasks, lambda n: agents[n].fallback_validation())
         
         # Combine initial reasoning with validations
         dialectical_chain = []
@@ -287,12 +737,15 @@ Make sure "selected_agents" is a list of strings only, using lowercase names lik
                 "dialectical_synthesis": validation.get("synthesis_suggestion", "")
             }
             dialectical_chain.append(dialectical_step)
+            _emit_step(i, dialectical_step)
         
         return dialectical_chain
 
 class ReasoningSynthesizer:
     """Advanced synthesis engine for multi-agent reasoning"""
     
+    __slots__ = ("metacognitive_reflector", "dialectical_challenger")
+    
     def __init__(self):
         self.metacognitive_reflector = MetacognitiveReflector()
         self.dialectical_challenger = DialogicalChallenger()
@@ -301,56 +754,47 @@ class ReasoningSynthesizer:
                                             query: str, 
                                             reasoning_chain: List[Dict],
                                             agent_selection: Dict,
-                                            cognitive_analysis: Dict) -> Dict[str, Any]:
-        """Generate comprehensive synthesis with metacognitive enhancement"""
+                                            cognitive_analysis: Dict,
+                                            history: Optional[List[Dict]] = None) -> Dict[str, Any]:
+        """Generate comprehensive synthesis with metacognitive enhancement
+        
+        history holds a session's earlier synthesis turns; they are replayed ahead of
+        this query and the new turn is appended to it on success.
+        """
         
         synthesis_prompt = f"""
-You are a master synthesizer creating transformative wisdom from multiple philosophical perspectives.
-
 ORIGINAL QUERY: "{query}"
 
 REASONING CHAIN:
-{json.dumps(reasoning_chain, indent=2)}
+{json_safe_str(self._compress_chain(reasoning_chain))}
 
 AGENT SELECTION RATIONALE:
-{json.dumps(agent_selection, indent=2)}
+{json_safe_str(agent_selection)}
 
 COGNITIVE ANALYSIS:
-{json.dumps(cognitive_analysis, indent=2)}
-
-Create a comprehensive synthesis as JSON:
-{{
-    "integrated_wisdom": "unified insight combining all perspectives",
-    "key_insights": ["most important discoveries"],
-    "practical_steps": ["specific actionable guidance"],
-    "metacognitive_enhancement": "how this process improves thinking skills",
-    "reasoning_quality_assessment": "evaluation of the reasoning process",
-    "cognitive_bridges": ["connections between different thinking modes"],
-    "transformative_elements": ["aspects that could change user's perspective"],
-    "application_scenarios": ["where this wisdom applies"],
-    "deepening_questions": ["questions for continued exploration"]
-}}
+{json_safe_str(cognitive_analysis)}
 """
         
         try:
-            messages = [{"role": "user", "content": synthesis_prompt}]
-            response = await self._call_ollama(messages, temperature=0.8, max_tokens=1500)
+            user_message = {"role": "user", "content": synthesis_prompt}
+            messages = [{"role": "system", "content": SYNTHESIS_INSTRUCTIONS}, *(history or ()), user_message]
+            response = await self._call_ollama(messages, temperature=0.8, max_tokens=1500, schema=SYNTHESIS_SCHEMA)
             
-            json_start = response.find('{')
-            json_end = response.rfind('}') + 1
-            if json_start >= 0 and json_end > json_start:
-                base_synthesis = json.loads(response[json_start:json_end])
-            else:
+            base_synthesis = extract_json(response)
+            if base_synthesis is None:
                 base_synthesis = self._create_fallback_synthesis(reasoning_chain)
+            elif history is not None:
+                # Earlier turns are never rewritten, so the next call extends this exact prefix
+                history.extend((user_message, {"role": "assistant", "content": response}))
         except Exception as e:
-            logger.error(f"Synthesis generation failed: {e}")
+            logger.error("Synthesis generation failed: %s", e)
             base_synthesis = self._create_fallback_synthesis(reasoning_chain)
         
         # Enhance with metacognitive prompts
-        metacognitive_prompts = await self.metacognitive_reflector.generate_metacognitive_prompts(reasoning_chain)
+        metacognitive_prompts = self.metacognitive_reflector.generate_metacognitive_prompts(reasoning_chain)
         
         # Add dialectical challenges
-        dialectical_challenges = await self.dialectical_challenger.generate_counter_perspectives(base_synthesis)
+        dialectical_challenges = self.dialectical_challenger.generate_counter_perspectives(base_synthesis)
         
         # Combine all synthesis elements
         enhanced_synthesis = {
@@ -365,12 +809,12 @@ Create a comprehensive synthesis as JSON:
     
     def _create_fallback_synthesis(self, reasoning_chain: List[Dict]) -> Dict[str, Any]:
         """Create basic synthesis when AI synthesis fails"""
-        philosophers = [step.get("philosopher", "Unknown") for step in reasoning_chain]
-        insights = [step.get("core_insight", "") for step in reasoning_chain]
+        # Only the first three insights are surfaced, so don't walk the rest of the chain
+        insights = [step.get("core_insight", "") for step in islice(reasoning_chain, 3)]
         
         return {
-            "integrated_wisdom": "Multiple philosophical perspectives offer complementary wisdom for addressing your concern.",
-            "key_insights": insights[:3],
+            "integrated_wisdom": FALLBACK_INTEGRATED_WISDOM,
+            "key_insights": insights,
             "practical_steps": ["Reflect on each perspective", "Choose the most resonant approach", "Take small action steps"],
             "metacognitive_enhancement": "This multi-perspective analysis enhances your ability to see complex issues from different angles",
             "reasoning_quality_assessment": "Good diversity of perspectives provided",
@@ -397,203 +841,405 @@ Create a comprehensive synthesis as JSON:
         """Identify cognitive enhancement elements in the reasoning"""
         enhancements = []
         
-        reasoning_types = [step.get("reasoning_type", "") for step in reasoning_chain]
+        # Gather everything the checks below need in one walk over the chain
+        reasoning_types = set()
+        philosophers = set()
+        has_catalyst = has_awareness = False
+        for step in reasoning_chain:
+            reasoning_types.add(step.get("reasoning_type", ""))
+            philosophers.add(step.get("philosopher", ""))
+            has_catalyst = has_catalyst or "socratic_catalyst" in step
+            has_awareness = has_awareness or "metacognitive_awareness" in step
+        
         if "analytical" in reasoning_types and "intuitive" in reasoning_types:
             enhancements.append("System 1.5 integration: bridging intuitive and analytical thinking")
         
-        if len(set(step.get("philosopher", "") for step in reasoning_chain)) >= 3:
+        if len(philosophers) >= 3:
             enhancements.append("Multi-perspective analysis: developing cognitive flexibility")
         
-        if any("socratic_catalyst" in step for step in reasoning_chain):
+        if has_catalyst:
             enhancements.append("Socratic questioning: improving inquiry skills")
         
-        if any("metacognitive_awareness" in step for step in reasoning_chain):
+        if has_awareness:
             enhancements.append("Metacognitive development: thinking about thinking")
         
         return enhancements
     
-    async def _call_ollama(self, messages: List[Dict], temperature: float = 0.7, max_tokens: int = 1000) -> str:
-        """Async Ollama API wrapper"""
-        def sync_call():
-            options = {"temperature": temperature, "num_predict": max_tokens}
-            resp = client.chat(model=OLLAMA_MODEL, messages=messages, options=options)
-            if isinstance(resp, dict):
-                return resp.get("message", {}).get("content", "")
-            return getattr(resp.message, "content", "")
+    @staticmethod
+    def _compress_chain(reasoning_chain: List[Dict]) -> List[Dict]:
+        """Reasoning chain for the synthesis prompt, kept within SYNTHESIS_CHAIN_MAX_CHARS.
+        
+        Every field is clipped first; if the chain is still too long, each step is cut
+        down to philosopher, reasoning type and core insight, with the insights sharing
+        the budget evenly. The client still receives the full chain.
+        """
+        steps = [
+            {field: _clip(value, SYNTHESIS_FIELD_MAX_CHARS) for field, value in _prompt_projection(step).items()}
+            for step in reasoning_chain
+        ]
+        if len(json_safe_str(steps)) <= SYNTHESIS_CHAIN_MAX_CHARS:
+            return steps
         
-        return await asyncio.to_thread(sync_call)
+        # Leave room per step for the keys, name and reasoning type around the insight
+        insight_limit = max(80, SYNTHESIS_CHAIN_MAX_CHARS // max(1, len(steps)) - 100)
+        return [
+            {field: _clip(step[field], insight_limit) if field == "core_insight" else step[field]
+             for field in ("philosopher", "reasoning_type", "core_insight") if field in step}
+            for step in steps
+        ]
+    
+    async def _call_ollama(self, messages: List[Dict], temperature: float = 0.7, max_tokens: int = 1000,
+                           schema: Optional[Dict[str, Any]] = None) -> str:
+        """Async Ollama API wrapper"""
+        return await _cached_chat(messages, temperature, max_tokens, source="Synthesis", schema=schema)
 
 class AdvancedWisdomCoordinator:
     """Revolutionary System 1.5 Metacognitive Reasoning Coordinator"""
     
+    __slots__ = ("system15_controller", "orchestrator", "synthesizer", "reasoning_cache",
+                 "_rule_crew", "_session_messages")
+    
     def __init__(self):
         self.system15_controller = System15Controller()
         self.orchestrator = AdvancedAgentOrchestrator()
         self.synthesizer = ReasoningSynthesizer()
-        self.reasoning_cache = {}
+        # Answers for session-less requests; a session's answer depends on its synthesis history
+        self.reasoning_cache = LLMCache(maxsize=RESULT_CACHE_SIZE, ttl=RESULT_CACHE_TTL)
+        # Rule-based council for the trivial-query fast path, built on first use
+        self._rule_crew = None
+        # Synthesis conversation per session_id (from the request context)
+        self._session_messages = LRUCache(maxsize=SESSION_HISTORY_SESSIONS)
         
+    _KNOWN_AGENTS = frozenset({'socrates', 'marcus', 'laotzu', 'aristotle', 'marcusaurelius'})
+    _NAME_SEPARATORS = str.maketrans('', '', ' -_')
+    
     def _normalize_agent_name(self, a: Any) -> str:
-        known_agents = {'socrates', 'marcus', 'laotzu', 'aristotle', 'marcusaurelius', 'lao-tzu'}
         if isinstance(a, str):
-            return a.lower().replace(' ', '').replace('-', '')
+            return a.translate(self._NAME_SEPARATORS).lower()
         if isinstance(a, dict):
-            for key, value in a.items():
-                lkey = key.lower().replace(' ', '').replace('-', '')
-                if lkey in known_agents:
-                    return lkey
-                if isinstance(value, str):
-                    lval = value.lower().replace(' ', '').replace('-', '')
-                    if lval in known_agents:
-                        return lval
-            return list(a.keys())[0] if a.keys() else 'unknown'
+            # First known name among the keys and string values, in item order
+            candidates = (
+                candidate.translate(self._NAME_SEPARATORS).lower()
+                for key, value in a.items()
+                for candidate in (key, value) if isinstance(candidate, str)
+            )
+            return next((name for name in candidates if name in self._KNOWN_AGENTS),
+                        next(iter(a), 'unknown'))
         return str(a)
     
-    async def process_wisdom_request(self, query: str, context: Optional[Dict] = None) -> AsyncGenerator[Dict[str, Any], None]:
-        """Stream real-time reasoning steps to the user"""
+    async def _run_collaboration(self, collaboration_pattern: str, agents: List, query: str, context: Dict,
+                                 embedding: Optional[Any] = None) -> List[Dict]:
+        if collaboration_pattern == "sequential":
+            return await self.orchestrator._sequential_reasoning(agents, query, context)
+        elif collaboration_pattern == "hierarchical":
+            return await self.orchestrator._hierarchical_reasoning(agents, query, context)
+        elif collaboration_pattern == "dialectical":
+            return await self.orchestrator._dialectical_reasoning(agents, query, context, embedding)
+        return await self.orchestrator._parallel_reasoning(agents, query, context, embedding)
+    
+    async def process_wisdom_request(self, query: str, context: Optional[Mapping] = None,
+                                     stream_tokens: bool = False,
+                                     include_synthesis: bool = True,
+                                     embedding: Optional[Any] = None) -> AsyncGenerator[Dict[str, Any], None]:
+        """Stream real-time reasoning steps to the user
+        
+        With stream_tokens, agent output is also forwarded as "reasoning_token"
+        events while the agents are still generating, and synthesis text as
+        "synthesis" events with status "streaming". Without include_synthesis
+        the synthesis LLM call is skipped and the result's "synthesis" is None.
+        A caller that already embedded the query passes the embedding along so
+        the reasoning step cache doesn't embed it again.
+        """
+        # The pipeline reports each event here as it happens, so steps are yielded as
+        # each one is final instead of after the whole council has finished
+        event_queue = asyncio.Queue()
+        pipeline = asyncio.create_task(
+            self._run_pipeline(query, context, include_synthesis, event_queue.put_nowait, stream_tokens, embedding)
+        )
         try:
-            # Step 1: Cognitive Load Analysis
-            yield {
-                "step": "cognitive_analysis",
-                "status": "processing",
-                "message": "Analyzing cognitive complexity and emotional context...",
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            
-            cognitive_analysis = await self.system15_controller.analyze_cognitive_load(query)
-            
-            yield {
-                "step": "cognitive_analysis",
-                "status": "complete",
-                "data": cognitive_analysis,
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            
-            # Step 2: Agent Selection
-            yield {
-                "step": "agent_selection",
-                "status": "processing",
-                "message": "Selecting optimal philosophical agents for your inquiry...",
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            
-            agent_selection = await self.orchestrator.select_optimal_agents(query, cognitive_analysis)
-            
-            yield {
-                "step": "agent_selection", 
-                "status": "complete",
-                "data": agent_selection,
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            
-            # Normalize selected_agents to ensure they are strings
-            agent_selection["selected_agents"] = [self._normalize_agent_name(a) for a in agent_selection["selected_agents"]]
-            
-            # Step 3: Multi-Agent Reasoning
-            yield {
-                "step": "reasoning_initiation",
-                "status": "processing", 
-                "message": f"Consulting the council of wisdom: {', '.join(agent_selection['selected_agents'])}...",
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            
-            # Create agent instances
-            agents = []
-            for agent_name in agent_selection["selected_agents"]:
-                try:
-                    agent = PhilosophicalAgentFactory.create_agent(agent_name)
-                    agents.append(agent)
-                except Exception as e:
-                    logger.error(f"Failed to create agent {agent_name}: {e}")
-                    continue
-            
-            # Execute collaboration pattern
-            collaboration_pattern = agent_selection.get("collaboration_pattern", "parallel")
-            reasoning_context = {
-                **(context or {}),
-                "cognitive_analysis": cognitive_analysis,
-                "agent_selection": agent_selection
-            }
-            
-            if collaboration_pattern == "sequential":
-                reasoning_chain = await self.orchestrator._sequential_reasoning(agents, query, reasoning_context)
-            elif collaboration_pattern == "hierarchical":
-                reasoning_chain = await self.orchestrator._hierarchical_reasoning(agents, query, reasoning_context)
-            elif collaboration_pattern == "dialectical":
-                reasoning_chain = await self.orchestrator._dialectical_reasoning(agents, query, reasoning_context)
-            else:
-                reasoning_chain = await self.orchestrator._parallel_reasoning(agents, query, reasoning_context)
-            
-            # Stream individual reasoning steps
-            for i, reasoning_step in enumerate(reasoning_chain):
-                yield {
-                    "step": "reasoning_step",
-                    "status": "complete",
-                    "step_number": i + 1,
-                    "total_steps": len(reasoning_chain),
-                    "data": reasoning_step,
-                    "timestamp": datetime.utcnow().isoformat()
-                }
-                
-                # Small delay for better UX streaming effect
-                await asyncio.sleep(0.1)
-            
-            # Step 4: Synthesis Generation
-            yield {
-                "step": "synthesis",
-                "status": "processing",
-                "message": "Synthesizing wisdom and generating metacognitive insights...",
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            
-            synthesis = await self.synthesizer.generate_comprehensive_synthesis(
-                query, reasoning_chain, agent_selection, cognitive_analysis
-            )
-            
-            yield {
-                "step": "synthesis",
-                "status": "complete", 
-                "data": synthesis,
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            
-            # Step 5: Final Integration
-            yield {
-                "step": "integration_complete",
-                "status": "complete",
-                "message": "Wisdom council has completed its deliberation",
-                "final_result": {
-                    "query": query,
-                    "cognitive_analysis": cognitive_analysis,
-                    "agent_selection": agent_selection,
-                    "reasoning_chain": reasoning_chain,
-                    "synthesis": synthesis,
-                    "philosophers_consulted": [agent.philosopher_name for agent in agents],
-                    "system_version": "AAIRS 2.0 - System 1.5 Framework",
-                    "processing_quality": "revolutionary_metacognitive_enhancement"
-                },
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            
+            async for event in self._forward_events(pipeline, event_queue):
+                yield event
+            await pipeline
         except Exception as e:
             logger.exception("Error in wisdom processing stream")
             yield {
                 "step": "error",
                 "status": "error",
                 "message": f"Wisdom processing encountered an error: {str(e)}",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": utc_now_iso()
             }
+        finally:
+            pipeline.cancel()
     
-    async def ask_wisdom(self, query: str, context: Optional[Dict] = None) -> Dict[str, Any]:
-        """Complete wisdom processing (non-streaming version)"""
-        final_result = None
+    async def _analyze(self, query: str) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]],
+                                                  Optional[Tuple[Dict[str, Any], asyncio.Task]]]:
+        """Cognitive analysis, plus the agent selection when fused routing already settled it,
+        or the (draft analysis, selection task) speculation started alongside the analysis.
+        
+        The caller owns the speculative task and must cancel it if it is never awaited."""
+        routing = await self.system15_controller.analyze_and_select(query) if FUSED_ROUTING else None
+        if routing is not None:
+            return routing[0], routing[1], None
+        
+        speculation = None
+        if SPECULATIVE_SELECTION:
+            draft_analysis = self.system15_controller.draft_cognitive_load(query)
+            speculation = (draft_analysis, asyncio.create_task(
+                self.orchestrator.select_optimal_agents(query, draft_analysis)
+            ))
+        try:
+            cognitive_analysis = await self.system15_controller.analyze_cognitive_load(query)
+        except BaseException:
+            if speculation is not None:
+                speculation[1].cancel()
+            raise
+        return cognitive_analysis, None, speculation
+    
+    async def _select(self, query: str, cognitive_analysis: Dict[str, Any],
+                      agent_selection: Optional[Dict[str, Any]],
+                      speculation: Optional[Tuple[Dict[str, Any], asyncio.Task]]) -> Dict[str, Any]:
+        """Settle the agent selection for the real analysis, reusing the speculative one if it still fits"""
+        if agent_selection is None:
+            if speculation is not None and self.system15_controller.draft_agrees(speculation[0], cognitive_analysis):
+                agent_selection = await speculation[1]
+            else:
+                if speculation is not None:
+                    speculation[1].cancel()
+                agent_selection = await self.orchestrator.select_optimal_agents(query, cognitive_analysis)
+        
+        # Normalize selected_agents to ensure they are strings
+        agent_selection["selected_agents"] = [self._normalize_agent_name(a) for a in agent_selection["selected_agents"]]
+        return agent_selection
+    
+    @staticmethod
+    def _create_agents(agent_names: List[str]) -> List:
+        agents = []
+        for agent_name in agent_names:
+            try:
+                agents.append(PhilosophicalAgentFactory.create_agent(agent_name))
+            except Exception as e:
+                logger.error("Failed to create agent %s: %s", agent_name, e)
+        return agents
+    
+    @staticmethod
+    def _reasoning_context(context: Optional[Mapping], cognitive_analysis: Dict, agent_selection: Dict) -> Dict:
+        # The session id only routes synthesis history; it's kept out of agent prompts
+        return {
+            **{key: value for key, value in (context or {}).items() if key != "session_id"},
+            "cognitive_analysis": cognitive_analysis,
+            "agent_selection": agent_selection
+        }
+    
+    @staticmethod
+    def _final_result(query: str, cognitive_analysis: Dict, agent_selection: Dict, reasoning_chain: List[Dict],
+                      synthesis: Optional[Dict], agents: List) -> Dict[str, Any]:
+        return {
+            "query": query,
+            "cognitive_analysis": cognitive_analysis,
+            "agent_selection": agent_selection,
+            "reasoning_chain": reasoning_chain,
+            "synthesis": synthesis,
+            "philosophers_consulted": [agent.philosopher_name for agent in agents],
+            "system_version": "AAIRS 2.0 - System 1.5 Framework",
+            "processing_quality": "revolutionary_metacognitive_enhancement"
+        }
+    
+    async def _cache_result(self, result_key: Optional[str], final_result: Dict[str, Any]):
+        if result_key is not None and is_cacheable_result(final_result):
+            await self.reasoning_cache.set(result_key, final_result)
+    
+    async def _run_pipeline(self, query: str, context: Optional[Mapping] = None,
+                            include_synthesis: bool = True,
+                            emit: Optional[Callable[[Dict[str, Any]], None]] = None,
+                            stream_tokens: bool = False,
+                            embedding: Optional[Any] = None,
+                            use_cache: bool = True) -> Dict[str, Any]:
+        """Every stage of a wisdom request, returning the final result.
+        
+        With emit, each progress event is reported to it as the stage starts or
+        finishes (process_wisdom_request streams them); without it, as for
+        ask_wisdom, no events are built at all. use_cache=False neither serves nor
+        stores a cached final result.
+        """
+        def progress(step: str, status: str, **fields):
+            if emit is not None:
+                emit({"step": step, "status": status, **fields, "timestamp": utc_now_iso()})
+        
+        if TRIVIAL_FAST_PATH and is_trivial_query(query):
+            return await self._rule_based_request(query, progress)
+        
+        session_id = (context or {}).get("session_id")
+        result_key = (_result_key(query, context)
+                      if use_cache and session_id is None and include_synthesis else None)
+        if result_key is not None:
+            cached = await self.reasoning_cache.get(result_key)
+            if cached is not None:
+                progress("integration_complete", "complete", cache_hit=True,
+                         message="Wisdom council has completed its deliberation", final_result=cached)
+                return cached
+        
+        # Step 1: Cognitive Load Analysis
+        progress("cognitive_analysis", "processing",
+                 message="Analyzing cognitive complexity and emotional context...")
+        cognitive_analysis, agent_selection, speculation = await self._analyze(query)
+        try:
+            progress("cognitive_analysis", "complete", data=cognitive_analysis)
+            
+            # Step 2: Agent Selection
+            progress("agent_selection", "processing",
+                     message="Selecting optimal philosophical agents for your inquiry...")
+            agent_selection = await self._select(query, cognitive_analysis, agent_selection, speculation)
+        finally:
+            if speculation is not None:
+                speculation[1].cancel()
+        progress("agent_selection", "complete", data=agent_selection)
+        
+        # Step 3: Multi-Agent Reasoning
+        progress("reasoning_initiation", "processing",
+                 message=f"Consulting the council of wisdom: {', '.join(agent_selection['selected_agents'])}...")
+        agents = self._create_agents(agent_selection["selected_agents"])
+        
+        streamed_steps = set()
+        
+        def report_step(i: int, reasoning_step: Dict):
+            streamed_steps.add(i)
+            progress("reasoning_step", "complete", step_number=i + 1, total_steps=len(agents), data=reasoning_step)
+        
+        # Agent tasks copy the current context, so their calls see the sinks
+        sink_tokens = []
+        if emit is not None:
+            sink_tokens.append((step_sink, step_sink.set(report_step)))
+            if stream_tokens:
+                sink_tokens.append((token_sink, token_sink.set(
+                    lambda philosopher, delta: progress("reasoning_token", "processing",
+                                                        philosopher=philosopher, delta=delta)
+                )))
+        try:
+            reasoning_chain = await self._run_collaboration(
+                agent_selection.get("collaboration_pattern", "parallel"), agents, query,
+                self._reasoning_context(context, cognitive_analysis, agent_selection), embedding
+            )
+        finally:
+            for sink, sink_token in reversed(sink_tokens):
+                sink.reset(sink_token)
         
-        async for step in self.process_wisdom_request(query, context):
-            if step.get("step") == "integration_complete":
-                final_result = step["final_result"]
-                break
+        # Report any reasoning steps the collaboration pattern didn't report itself
+        if emit is not None:
+            for i, reasoning_step in enumerate(reasoning_chain):
+                if i not in streamed_steps:
+                    progress("reasoning_step", "complete", step_number=i + 1,
+                             total_steps=len(reasoning_chain), data=reasoning_step)
+        
+        # Step 4: Synthesis Generation
+        synthesis = None
+        if include_synthesis:
+            progress("synthesis", "processing",
+                     message="Synthesizing wisdom and generating metacognitive insights...")
+            # Synthesis text streams like agent tokens, as "streaming" synthesis events
+            sink_token = None
+            if emit is not None and stream_tokens:
+                sink_token = token_sink.set(lambda source, delta: progress("synthesis", "streaming", delta=delta))
+            try:
+                synthesis = await self.synthesizer.generate_comprehensive_synthesis(
+                    query, reasoning_chain, agent_selection, cognitive_analysis, self._session_history(session_id)
+                )
+            finally:
+                if sink_token is not None:
+                    token_sink.reset(sink_token)
+            progress("synthesis", "complete", data=synthesis)
+        
+        # Step 5: Final Integration
+        final_result = self._final_result(query, cognitive_analysis, agent_selection, reasoning_chain,
+                                          synthesis, agents)
+        await self._cache_result(result_key, final_result)
+        progress("integration_complete", "complete",
+                 message="Wisdom council has completed its deliberation", final_result=final_result)
+        return final_result
+    
+    @staticmethod
+    async def _forward_events(task: asyncio.Task, event_queue: asyncio.Queue) -> AsyncGenerator[Any, None]:
+        """Yield queued events as they arrive until the task finishes and the queue is drained"""
+        while not task.done() or not event_queue.empty():
+            next_event = asyncio.ensure_future(event_queue.get())
+            await asyncio.wait({next_event, task}, return_when=asyncio.FIRST_COMPLETED)
+            if not next_event.done():
+                next_event.cancel()
+                continue
+            yield next_event.result()
+    
+    def _session_history(self, session_id: Optional[str]) -> Optional[List[Dict]]:
+        if session_id is None:
+            return None
+        history = self._session_messages.get(session_id)
+        if history is None or sum(len(message["content"]) for message in history) > SYNTHESIS_HISTORY_MAX_CHARS:
+            history = self._session_messages[session_id] = []
+        return history
+    
+    async def _rule_based_request(self, query: str, progress: Callable[..., None]) -> Dict[str, Any]:
+        """Answer a trivial query from the rule-based agents, reporting the same events as the LLM pipeline"""
+        if self._rule_crew is None:
+            from crew import WisdomCrew
+            self._rule_crew = WisdomCrew()
+        
+        responses = await self._rule_crew.ask_wisdom(query)
+        
+        agent_selection = {
+            "selected_agents": list(responses),
+            "primary_agent": next(iter(responses)),
+            "collaboration_pattern": "rule_based",
+            "reasoning_depth": "surface",
+            "selection_rationale": "Brief query answered by the rule-based council",
+            "expected_synergies": ["Diverse philosophical perspectives"]
+        }
+        progress("agent_selection", "complete", data=agent_selection)
         
-        return final_result or {
-            "error": "Processing failed",
+        reasoning_chain = [
+            {
+                "philosopher": RULE_BASED_PHILOSOPHERS[name],
+                "reasoning_type": "intuitive",
+                "core_insight": response,
+                "reasoning_process": f"{RULE_BASED_PHILOSOPHERS[name]} responds to the key terms of a brief inquiry"
+            }
+            for name, response in responses.items()
+        ]
+        for i, reasoning_step in enumerate(reasoning_chain):
+            progress("reasoning_step", "complete", step_number=i + 1,
+                     total_steps=len(reasoning_chain), data=reasoning_step)
+        
+        base_synthesis = self.synthesizer._create_fallback_synthesis(reasoning_chain)
+        synthesis = {
+            **base_synthesis,
+            "synthesis_quality_score": self.synthesizer._calculate_synthesis_quality(base_synthesis, reasoning_chain),
+            "cognitive_enhancement_elements": self.synthesizer._identify_cognitive_enhancements(reasoning_chain)
+        }
+        progress("synthesis", "complete", data=synthesis)
+        
+        final_result = {
             "query": query,
-            "timestamp": datetime.utcnow().isoformat()
-        }
\ No newline at end of file
+            # Same shape as the LLM pipeline's result, from the instant keyword estimate
+            "cognitive_analysis": self.system15_controller.draft_cognitive_load(query),
+            "agent_selection": agent_selection,
+            "reasoning_chain": reasoning_chain,
+            "synthesis": synthesis,
+            "philosophers_consulted": [step["philosopher"] for step in reasoning_chain],
+            "system_version": "AAIRS 2.0 - System 1.5 Framework",
+            "processing_quality": "rule_based_fast_path"
+        }
+        progress("integration_complete", "complete",
+                 message="Wisdom council has completed its deliberation", final_result=final_result)
+        return final_result
+    
+    async def ask_wisdom(self, query: str, context: Optional[Mapping] = None,
+                         include_synthesis: bool = True, embedding: Optional[Any] = None,
+                         use_cache: bool = True) -> Dict[str, Any]:
+        """Complete wisdom processing (non-streaming version)"""
+        try:
+            return await self._run_pipeline(query, context, include_synthesis, embedding=embedding,
+                                            use_cache=use_cache)
+        except Exception:
+            logger.exception("Error in wisdom processing")
+            return {
+                "error": "Processing failed",
+                "query": query,
+                "timestamp": utc_now_iso()
+            }
\ No newline at end of file
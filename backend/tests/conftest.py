@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The service imports its modules top-level (`from tools.x import ...`), as when run from src/backend
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "backend"))
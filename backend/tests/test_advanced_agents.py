@@ -0,0 +1,58 @@
+import pytest
+
+pytest.importorskip("crewai")
+
+from tools.advanced_agents import (
+    _LAOTZU_FORCING_TERMS,
+    _SOCRATES_ASSUMPTION_TERMS,
+    _SOCRATES_VALUE_TERMS,
+    _aristotle_virtues,
+    _query_features,
+    _stems
+)
+
+
+@pytest.mark.parametrize("token, stem", [
+    ("shouldn't", "should"),
+    ("mustn't", "must"),
+    ("successful", "success"),
+    ("decisions", "decision"),
+    ("choices", "choice"),
+    ("controlling", "control"),
+    ("deserved", "deserve"),
+    ("trusted", "trust"),
+    ("everyone's", "everyone"),
+])
+def test_stems_fold_inflections_onto_the_keyword(token, stem):
+    assert stem in set(_stems(token))
+
+
+def test_stems_are_never_too_short():
+    assert set(_stems("won't")) == set()
+    assert all(len(stem) >= 3 for stem in _stems("beds"))
+
+
+def test_negated_forms_trigger_the_assumption_branch():
+    assert not _SOCRATES_ASSUMPTION_TERMS.isdisjoint(_query_features("i shouldn't worry about it"))
+    assert not _LAOTZU_FORCING_TERMS.isdisjoint(_query_features("you mustn't rush"))
+
+
+def test_inflected_forms_match_value_terms():
+    assert not _SOCRATES_VALUE_TERMS.isdisjoint(_query_features("is being successful worth it"))
+
+
+def test_words_that_merely_contain_a_keyword_do_not_match():
+    features = _query_features("a bright badge at the enforcement office")
+    assert _SOCRATES_VALUE_TERMS.isdisjoint(features)
+    assert _LAOTZU_FORCING_TERMS.isdisjoint(features)
+
+
+def test_features_include_word_pairs():
+    features = _query_features("i have to decide")
+    assert "have to" in features
+    assert not _LAOTZU_FORCING_TERMS.isdisjoint(features)
+
+
+def test_aristotle_virtues_from_inflected_words():
+    assert _aristotle_virtues(_query_features("i'm controlling everything and my fears")) == {"courage", "temperance"}
+    assert _aristotle_virtues(_query_features("i deserved better decisions")) == {"justice", "prudence"}
@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from crew import WisdomCrew
+
+
+def set_response(monkeypatch, agent, respond):
+    # crewai agents are pydantic models, so patch the class rather than the instance
+    monkeypatch.setattr(type(agent), "generate_response", lambda self, text: respond(text))
+
+
+@pytest.fixture
+def crew(monkeypatch):
+    crew = WisdomCrew(cache_size=2)
+    calls = []
+    for name, agent in crew.agents.items():
+        def respond(text, name=name):
+            calls.append((name, text))
+            return f"{name}: {text}"
+        set_response(monkeypatch, agent, respond)
+    crew.calls = calls
+    return crew
+
+
+def test_answers_every_agent_in_order(crew):
+    responses = asyncio.run(crew.ask_wisdom("Why worry?"))
+    assert list(responses) == ["socrates", "marcus", "laotzu", "aristotle"]
+    assert responses["marcus"] == "marcus: Why worry?"
+
+
+def test_concurrent_identical_asks_consult_each_agent_once(crew):
+    async def main():
+        return await asyncio.gather(*(crew.ask_wisdom("Why worry?") for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert all(dict(result) == dict(results[0]) for result in results)
+    assert sorted(name for name, _ in crew.calls) == ["aristotle", "laotzu", "marcus", "socrates"]
+
+
+def test_cache_key_ignores_case_and_surrounding_space(crew):
+    asyncio.run(crew.ask_wisdom("Why worry?"))
+    asyncio.run(crew.ask_wisdom({"text": "  why WORRY?  "}))
+    assert len(crew.calls) == 4
+
+
+def test_partial_eviction_only_reruns_the_missing_agent(crew):
+    asyncio.run(crew.ask_wisdom("Why worry?"))
+    key = next(key for key in crew._cache if key[0] == "laotzu")
+    del crew._cache[key]
+
+    responses = asyncio.run(crew.ask_wisdom("Why worry?"))
+    assert responses["laotzu"] == "laotzu: Why worry?"
+    assert [name for name, _ in crew.calls[4:]] == ["laotzu"]
+
+
+def test_empty_answers_are_retried(crew, monkeypatch):
+    set_response(monkeypatch, crew.agents["socrates"], lambda text: "")
+    asyncio.run(crew.ask_wisdom("Why worry?"))
+    set_response(monkeypatch, crew.agents["socrates"], lambda text: "now an answer")
+    assert asyncio.run(crew.ask_wisdom("Why worry?"))["socrates"] == "now an answer"
+
+
+def test_preview_prefers_a_cached_answer(crew):
+    asyncio.run(crew.ask_wisdom("Why worry?"))
+    del crew._cache[next(key for key in crew._cache if key[0] == "socrates")]
+    assert asyncio.run(crew.ask_wisdom_preview("Why worry?")) == ("marcus", "marcus: Why worry?")
+    assert len(crew.calls) == 4
+
+
+def test_preview_consults_only_the_first_agent(crew):
+    assert asyncio.run(crew.ask_wisdom_preview("Why worry?")) == ("socrates", "socrates: Why worry?")
+    assert crew.calls == [("socrates", "Why worry?")]
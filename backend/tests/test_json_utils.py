@@ -0,0 +1,75 @@
+from collections import ChainMap
+
+from tools.json_utils import JsonObjectParser, extract_json, json_safe_str
+
+
+def feed_all(chunks):
+    parser = JsonObjectParser()
+    result = None
+    for chunk in chunks:
+        result = parser.feed(chunk)
+    return result
+
+
+def test_extracts_object_surrounded_by_prose():
+    assert extract_json('Here is my answer: {"a": 1, "b": [2, 3]} Hope it helps.') == {"a": 1, "b": [2, 3]}
+
+
+def test_braces_inside_strings_do_not_affect_depth():
+    raw = '{"text": "a } and a { inside", "n": 1}'
+    assert extract_json(raw) == {"text": "a } and a { inside", "n": 1}
+
+
+def test_escaped_quotes_do_not_end_the_string():
+    raw = r'{"text": "she said \"}\" twice", "ok": true}'
+    assert extract_json(raw) == {"text": 'she said "}" twice', "ok": True}
+
+
+def test_invalid_balanced_candidate_is_skipped():
+    assert extract_json('{thinking} then {"answer": 42}') == {"answer": 42}
+
+
+def test_nested_objects_are_returned_whole():
+    assert extract_json('{"outer": {"inner": {"x": 1}}}') == {"outer": {"inner": {"x": 1}}}
+
+
+def test_no_object_returns_none():
+    assert extract_json("no json here") is None
+    assert extract_json('{"unterminated": 1') is None
+
+
+def test_object_split_across_chunks():
+    raw = 'Sure. {"text": "a \\"quoted\\" } brace", "list": [1, {"k": "v"}]} trailing'
+    expected = {"text": 'a "quoted" } brace', "list": [1, {"k": "v"}]}
+    # Every split point, including inside strings and right after an escape
+    for cut in range(1, len(raw)):
+        assert feed_all([raw[:cut], raw[cut:]]) == expected, cut
+    assert feed_all(list(raw)) == expected
+
+
+def test_incomplete_object_waits_for_more_input():
+    parser = JsonObjectParser()
+    assert parser.feed('{"a": ') is None
+    assert parser.feed('"}"') is None
+    assert parser.feed("}") == {"a": "}"}
+
+
+def test_result_is_kept_once_found():
+    parser = JsonObjectParser()
+    assert parser.feed('{"first": 1}') == {"first": 1}
+    assert parser.feed('{"second": 2}') == {"first": 1}
+
+
+def test_non_object_json_is_not_a_result():
+    assert extract_json('[1, 2] {"a": 1}') == {"a": 1}
+
+
+def test_json_safe_str_flattens_mappings_and_stringifies_the_rest():
+    value = ChainMap({"a": 1}, {"b": object.__name__})
+    assert json_safe_str({"ctx": value, 1: "x"}) == '{"ctx":{"b":"object","a":1},"1":"x"}'
+
+
+def test_json_safe_str_sorts_nested_keys_on_request():
+    first = json_safe_str({"b": {"y": 2, "x": 1}, "a": ChainMap({"d": 1, "c": 2})}, sort_keys=True)
+    second = json_safe_str({"a": {"c": 2, "d": 1}, "b": {"x": 1, "y": 2}}, sort_keys=True)
+    assert first == second == '{"a":{"c":2,"d":1},"b":{"x":1,"y":2}}'
@@ -0,0 +1,110 @@
+import numpy as np
+
+import tools.semantic_cache as semantic_cache
+from tools.semantic_cache import SemanticCache, cache_bucket
+
+
+def unit(*values):
+    vector = np.array([values], dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+LOST = unit(1, 0, 0)
+CAREER = unit(0, 1, 0)
+CONFLICT = unit(0, 0, 1)
+
+
+def test_similar_query_hits_in_the_same_bucket():
+    cache = SemanticCache()
+    cache.add("I feel lost in my life", LOST, "answer")
+    assert cache.lookup("I feel so lost in my life", LOST) == "answer"
+    assert cache.stats()["hits"] == 1
+
+
+def test_dissimilar_embedding_misses():
+    cache = SemanticCache()
+    cache.add("I feel lost in my life", LOST, "answer")
+    assert cache.lookup("I feel lost in my life", CAREER) is None
+
+
+def test_close_embedding_without_lexical_overlap_misses():
+    cache = SemanticCache()
+    cache.add("I feel lost in my life", LOST, "answer")
+    assert cache.lookup("Tell me about stoic virtue ethics", LOST) is None
+
+
+def test_shards_are_isolated():
+    cache = SemanticCache()
+    cache.add("What would Socrates say about courage", LOST, "socrates", cache_bucket("What would Socrates say"))
+    cache.add("What would Aristotle say about courage", LOST, "aristotle", cache_bucket("What would Aristotle say"))
+    assert cache.lookup("What would Socrates say about courage", LOST,
+                        cache_bucket("Socrates on courage")) == "socrates"
+    assert cache.lookup("What would Aristotle say about courage", LOST,
+                        cache_bucket("Aristotle on courage")) == "aristotle"
+    assert cache.lookup("What would Socrates say about courage", LOST) is None
+    assert cache.stats()["shards"] == 2
+
+
+def test_entry_cap_evicts_the_oldest_entry_across_shards():
+    cache = SemanticCache(max_entries=2)
+    cache.add("feeling lost today", LOST, "lost", frozenset({"socrates"}))
+    cache.add("career change worries", CAREER, "career", frozenset({"marcus"}))
+    cache.add("conflict with family", CONFLICT, "conflict", frozenset({"marcus"}))
+
+    assert cache.lookup("feeling lost today", LOST, frozenset({"socrates"})) is None
+    assert cache.lookup("career change worries", CAREER, frozenset({"marcus"})) == "career"
+    assert cache.lookup("conflict with family", CONFLICT, frozenset({"marcus"})) == "conflict"
+    assert cache.stats()["entries"] == 2
+    # The emptied shard is dropped rather than kept around
+    assert cache.stats()["shards"] == 1
+
+
+def test_eviction_keeps_embeddings_aligned_with_entries():
+    cache = SemanticCache(max_entries=2)
+    cache.add("feeling lost today", LOST, "lost")
+    cache.add("career change worries", CAREER, "career")
+    cache.add("conflict with family", CONFLICT, "conflict")
+    assert cache.lookup("career change worries", CAREER) == "career"
+    assert cache.lookup("conflict with family", CONFLICT) == "conflict"
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(semantic_cache.time, "monotonic", lambda: now[0])
+    cache = SemanticCache(ttl=60)
+    cache.add("feeling lost today", LOST, "lost")
+    now[0] += 30
+    cache.add("career change worries", CAREER, "career")
+
+    now[0] += 31
+    assert cache.lookup("feeling lost today", LOST) is None
+    assert cache.lookup("career change worries", CAREER) == "career"
+    assert cache.stats()["entries"] == 1
+
+
+def test_zero_ttl_keeps_entries():
+    cache = SemanticCache(ttl=0)
+    cache.add("feeling lost today", LOST, "lost")
+    assert cache.lookup("feeling lost today", LOST) == "lost"
+
+
+def test_missing_embedding_is_neither_stored_nor_matched():
+    cache = SemanticCache()
+    cache.add("feeling lost today", None, "lost")
+    assert cache.stats()["entries"] == 0
+    assert cache.lookup("feeling lost today", None) is None
+
+
+def test_cache_bucket_uses_named_philosophers():
+    assert cache_bucket("What would a Stoic like Marcus Aurelius do?") == {"marcus"}
+    assert cache_bucket("Compare the Tao with Aristotle") == {"laotzu", "aristotle"}
+    assert cache_bucket("How do I stop worrying?") == frozenset()
+
+
+def test_cache_bucket_keeps_only_known_preferred_agents():
+    assert cache_bucket("hello", ["Socrates", "laotzu"]) == {"socrates", "laotzu"}
+    assert cache_bucket("hello", ["socrates", "someone-else", 7, None]) == {"socrates"}
+    # A bare string is not split into letters, and non-lists are ignored
+    assert cache_bucket("hello", "socrates") == frozenset()
+    assert cache_bucket("hello", 42) == frozenset()
+    assert cache_bucket("hello", {"socrates": True}) == frozenset()
@@ -0,0 +1,107 @@
+import asyncio
+from collections import ChainMap
+
+import pytest
+
+from wisdom_coordinator import (
+    FALLBACK_INTEGRATED_WISDOM,
+    _gather_or_cancel,
+    context_digest,
+    is_cacheable_result
+)
+
+
+def test_gather_returns_results_in_order():
+    async def value(v, delay):
+        await asyncio.sleep(delay)
+        return v
+
+    results = asyncio.run(_gather_or_cancel([value("a", 0.02), value("b", 0), value("c", 0.01)],
+                                            lambda i: f"fallback {i}"))
+    assert results == ["a", "b", "c"]
+
+
+def test_failure_cancels_peers_and_falls_back_per_index():
+    cancelled = []
+    finished = []
+
+    async def fast(v):
+        finished.append(v)
+        return v
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ConnectionError("ollama went away")
+
+    async def slow(i):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(i)
+            raise
+        return i
+
+    async def main():
+        start = asyncio.get_running_loop().time()
+        results = await _gather_or_cancel([fast("a"), fail(), slow(2), slow(3)], lambda i: f"fallback {i}")
+        return results, asyncio.get_running_loop().time() - start
+
+    results, elapsed = asyncio.run(main())
+    assert results == ["a", "fallback 1", "fallback 2", "fallback 3"]
+    assert sorted(cancelled) == [2, 3]
+    assert finished == ["a"]
+    assert elapsed < 1
+
+
+def test_timeout_counts_as_failure():
+    async def timed_out():
+        return await asyncio.wait_for(asyncio.sleep(10), 0.01)
+
+    results = asyncio.run(_gather_or_cancel([timed_out()], lambda i: "fallback"))
+    assert results == ["fallback"]
+
+
+def test_outer_cancellation_cancels_every_task():
+    cancelled = []
+
+    async def slow(i):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(i)
+            raise
+
+    async def main():
+        gather = asyncio.ensure_future(_gather_or_cancel([slow(0), slow(1)], lambda i: None))
+        await asyncio.sleep(0.01)
+        gather.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await gather
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert sorted(cancelled) == [0, 1]
+
+
+def test_empty_input():
+    assert asyncio.run(_gather_or_cancel([], lambda i: None)) == []
+
+
+def test_context_digest_ignores_key_order_at_every_level():
+    assert context_digest({"a": {"x": 1, "y": 2}, "b": [1, 2]}) == context_digest({"b": [1, 2], "a": {"y": 2, "x": 1}})
+    assert context_digest(ChainMap({"mode": "batch"}, {"a": {"x": 1}})) == context_digest({"a": {"x": 1}, "mode": "batch"})
+    assert context_digest(None) == context_digest({})
+
+
+def test_context_digest_distinguishes_values():
+    assert context_digest({"a": {"x": 1}}) != context_digest({"a": {"x": 2}})
+    assert context_digest({"a": [1, 2]}) != context_digest({"a": [2, 1]})
+
+
+def test_only_model_synthesized_results_are_cacheable():
+    assert is_cacheable_result({"synthesis": {"integrated_wisdom": "Act on what you control."}})
+    assert not is_cacheable_result({"synthesis": {"integrated_wisdom": FALLBACK_INTEGRATED_WISDOM}})
+    assert not is_cacheable_result({"synthesis": None})
+    assert not is_cacheable_result({"reasoning_chain": []})
+    assert not is_cacheable_result({"error": "Processing failed",
+                                    "synthesis": {"integrated_wisdom": "Act on what you control."}})